@@ -14,10 +14,13 @@ from typing import Any, Dict, List, Optional, TextIO
 
 from flask import Flask
 from flask_migrate import Migrate
+from jinja2 import FileSystemBytecodeCache
 from sqlalchemy.exc import SQLAlchemyError
 
 from .models import db, AppSetting, LLMProvider, ModelConfig
 from .bot.bot_service import TelegramBotManager
+from .bot.bot_tasks import BotTaskRunner
+from .web.json_provider import OrjsonProvider
 from dotenv import load_dotenv
 
 
@@ -34,7 +37,9 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
     Returns:
         Настроенный экземпляр Flask-приложения.
     """
-    app = Flask(__name__, instance_relative_config=True)
+    # Шаблоны лежат в одном каталоге, поэтому поиск не перебирает загрузчики blueprint'ов.
+    app = Flask(__name__, instance_relative_config=True, template_folder="web/templates")
+    app.json = OrjsonProvider(app)
 
     # РЕЖИМ ЗАПУСКА: normal | migrate
     # В режиме "migrate" мы не регистрируем blueprint'ы и не инициализируем бота,
@@ -51,6 +56,8 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
         SQLALCHEMY_DATABASE_URI=default_db_path,
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
         TELEGRAM_WEBHOOK_HOST=os.environ.get("AI_ROUTER_WEBHOOK_HOST", ""),
+        # Cookie сессии переподписывается только при её изменении, а не на каждом ответе.
+        SESSION_REFRESH_EACH_REQUEST=False,
     )
 
     # Загружаем учётные данные админа из окружения или .env.
@@ -62,9 +69,11 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
 
     if config:
         app.config.update(config)
+    _configure_engine_options(app)
 
     _configure_logging(app)
     _ensure_instance_folder(app)
+    _configure_template_cache(app)
 
     # Инициализация БД и миграций.
     db.init_app(app)
@@ -78,10 +87,13 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
     # ⚠️ Критично: не трогаем БД на этапе миграций (первый старт).
     if BOOT_MODE != "migrate":
         _register_blueprints(app)
+        _warm_template_cache(app)
 
         # Менеджер бота (может обращаться к настройкам) — только вне режима миграций.
         bot_manager = TelegramBotManager(app)
         app.extensions["bot_manager"] = bot_manager
+        # Операции запуска/остановки бота выполняются вне потока HTTP-запроса.
+        app.extensions["bot_tasks"] = BotTaskRunner(app)
 
     return app
 
@@ -138,6 +150,56 @@ def _ensure_instance_folder(app: Flask) -> None:
         app.logger.exception("Не удалось создать директорию instance")
 
 
+def _configure_engine_options(app: Flask) -> None:
+    """Настраивает пул соединений для серверных СУБД, если он не задан явно."""
+
+    # SQLite работает с локальным файлом: проверка соединения и переработка
+    # по времени ему не нужны, а StaticPool в памяти не принимает размеры пула.
+    database_uri = str(app.config.get("SQLALCHEMY_DATABASE_URI", ""))
+    if database_uri.startswith("sqlite"):
+        return
+    # Пул рассчитан на потоки HTTP-сервера, обработчики бота и фоновые задачи;
+    # LIFO держит горячими недавно использованные соединения.
+    app.config.setdefault(
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        {
+            "pool_size": int(os.environ.get("AI_ROUTER_DB_POOL_SIZE", "10")),
+            "max_overflow": int(os.environ.get("AI_ROUTER_DB_MAX_OVERFLOW", "20")),
+            "pool_pre_ping": True,
+            "pool_recycle": 1800,
+            "pool_use_lifo": True,
+        },
+    )
+
+
+def _configure_template_cache(app: Flask) -> None:
+    """Включает файловый кеш байткода Jinja, чтобы не компилировать шаблоны заново."""
+
+    cache_directory = Path(app.instance_path) / "jinja_cache"
+    try:
+        cache_directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        app.logger.exception("Не удалось создать директорию кеша шаблонов")
+        return
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(directory=str(cache_directory)),
+    }
+
+
+def _warm_template_cache(app: Flask) -> None:
+    """Заранее загружает шаблоны, чтобы первый запрос не тратил время на их разбор."""
+
+    # Вне debug Flask не проверяет mtime шаблонов, поэтому загруженные шаблоны
+    # остаются в памяти окружения до перезапуска процесса.
+    env = app.jinja_env
+    for template_name in env.list_templates(extensions=("html",)):
+        try:
+            env.get_template(template_name)
+        except Exception:  # pylint: disable=broad-except
+            app.logger.exception("Не удалось предварительно загрузить шаблон %s", template_name)
+
+
 def _try_seed_defaults(app: Flask) -> None:
     """Пытается создать базовые настройки и дефолтную модель, если таблицы уже существуют."""
     try:
@@ -218,19 +280,15 @@ def _ensure_default_model() -> None:
 def _register_blueprints(app: Flask) -> None:
     """Регистрирует веб-интерфейсы и API в приложении."""
     from .services.settings_service import SettingsService
-    from .web.admin import admin_bp  # Импорт внутри функции для корректного порядка загрузки
-    from .web.telegram_webhook import (
-        register_telegram_webhook_route,
-        telegram_webhook_bp,
-    )
+    from .web.admin import register_admin_blueprint  # Импорт внутри функции для корректного порядка загрузки
+    from .web.telegram_webhook import create_telegram_webhook_blueprint
 
     with app.app_context():
         settings_service = SettingsService()
         webhook_path = settings_service.get_webhook_path()
 
-    register_telegram_webhook_route(webhook_path)
-    app.register_blueprint(telegram_webhook_bp)
-    app.register_blueprint(admin_bp)
+    app.register_blueprint(create_telegram_webhook_blueprint(webhook_path))
+    register_admin_blueprint(app)
 
 
 def _get_preferred_log_encoding() -> str:
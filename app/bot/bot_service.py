@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import queue
 import threading
 import time
 from contextlib import contextmanager
@@ -14,10 +15,15 @@ from telebot import TeleBot, types
 
 from ..services.llm_service import LLMService
 from ..services.settings_service import SettingsService
+from ..services.user_activity_service import UserActivityBuffer
 from .dialog_management import DialogManagementMixin
 from .message_handlers import MessageHandlingMixin
 
 
+# NOTE[agent]: Предел очереди webhook-обновлений; при переполнении отбрасываются самые старые.
+WEBHOOK_QUEUE_MAXSIZE = 1000
+
+
 # NOTE[agent]: Исключение для сигнализации о зависшем polling-потоке.
 class PollingStopTimeoutError(RuntimeError):
     """Исключение, сигнализирующее о незавершившемся потоке polling."""
@@ -166,6 +172,71 @@ class BotLifecycleMixin:
         update = types.Update.de_json(data)
         self._bot.process_new_updates([update])
 
+    # NOTE[agent]: Ставит обновление webhook в очередь, не задерживая ответ Telegram.
+    def submit_webhook_update(self, data: dict) -> None:
+        """Передаёт обновление на обработку в фоновый поток.
+
+        При переполнении очереди отбрасывается самое старое обновление, чтобы
+        объём памяти оставался ограниченным.
+
+        Args:
+            data: JSON-представление обновления Telegram.
+        """
+
+        self._ensure_webhook_worker()
+        try:
+            self._webhook_queue.put_nowait(data)
+            return
+        except queue.Full:
+            pass
+        try:
+            self._webhook_queue.get_nowait()
+            self._webhook_queue.task_done()
+        except queue.Empty:
+            pass
+        self._get_logger().warning("Очередь webhook переполнена, старейшее обновление отброшено")
+        try:
+            self._webhook_queue.put_nowait(data)
+        except queue.Full:
+            self._get_logger().warning("Не удалось поставить обновление webhook в очередь")
+
+    # NOTE[agent]: Запускает поток разбора очереди webhook при первом обращении.
+    def _ensure_webhook_worker(self) -> None:
+        """Создаёт фоновый поток обработки webhook, если он ещё не запущен."""
+
+        with self._webhook_worker_lock:
+            worker = self._webhook_worker
+            if worker is not None and worker.is_alive():
+                return
+            worker = threading.Thread(
+                target=self._webhook_worker_loop,
+                name="telegram-webhook",
+                daemon=True,
+            )
+            self._webhook_worker = worker
+            worker.start()
+
+    # NOTE[agent]: Последовательно обрабатывает обновления из очереди webhook.
+    def _webhook_worker_loop(self) -> None:
+        """Забирает обновления из очереди и передаёт их TeleBot."""
+
+        while True:
+            data = self._webhook_queue.get()
+            try:
+                self._process_webhook_update_safely(data)
+            finally:
+                self._webhook_queue.task_done()
+
+    # NOTE[agent]: Обрабатывает обновление в контексте приложения и логирует ошибки.
+    def _process_webhook_update_safely(self, data: dict) -> None:
+        """Выполняет process_webhook_update в фоновом потоке."""
+
+        with self._app_context():
+            try:
+                self.process_webhook_update(data)
+            except Exception:  # pylint: disable=broad-except
+                self._get_logger().exception("Ошибка при обработке обновления webhook")
+
     # NOTE[agent]: Внутренний цикл polling с устойчивостью к ошибкам.
     def _polling_loop(self) -> None:
         """Запускает TeleBot в бесконечном цикле с перезапуском при ошибке."""
@@ -209,9 +280,12 @@ class BotLifecycleMixin:
 
     # NOTE[agent]: Сохраняет ссылку на Flask-приложение для фоновых потоков.
     def init_app(self, app: Flask) -> None:
-        """Сохраняет ссылку на Flask-приложение."""
+        """Сохраняет ссылку на Flask-приложение и запускает фоновые службы."""
 
         self._app = app
+        activity_buffer: Optional[UserActivityBuffer] = getattr(self, "_activity_buffer", None)
+        if activity_buffer is not None:
+            activity_buffer.start(app)
 
     # NOTE[agent]: Оповещает администраторов об ошибке polling, если поддерживается.
     def _notify_polling_error(self, exception: Exception) -> None:
@@ -250,9 +324,15 @@ class TelegramBotManager(BotLifecycleMixin, MessageHandlingMixin, DialogManageme
 
         self._settings = SettingsService()
         self._llm = LLMService()
+        self._activity_buffer = UserActivityBuffer()
         self._bot: Optional[TeleBot] = None
         self._polling_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # NOTE[agent]: Один поток сохраняет порядок обновлений; обработчики TeleBot
+        # и так выполняются в собственном пуле потоков.
+        self._webhook_queue: "queue.Queue[dict]" = queue.Queue(maxsize=WEBHOOK_QUEUE_MAXSIZE)
+        self._webhook_worker: Optional[threading.Thread] = None
+        self._webhook_worker_lock = threading.Lock()
         self._app: Optional[Flask] = None
         if app is not None:
             self.init_app(app)
@@ -0,0 +1,90 @@
+"""Фоновое выполнение операций жизненного цикла Telegram-бота."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask
+
+
+# NOTE[agent]: Класс выносит запуск/остановку бота из потока обработки HTTP-запроса.
+class BotTaskRunner:
+    """Последовательно выполняет операции бота в отдельном потоке."""
+
+    STATUS_IDLE = "idle"
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, app: Flask) -> None:
+        """Создаёт однопоточный исполнитель для операций бота.
+
+        Args:
+            app: Приложение Flask, в контексте которого выполняются операции.
+        """
+
+        self._app = app
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-lifecycle")
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+        self._state: Dict[str, Any] = {
+            "operation": None,
+            "status": self.STATUS_IDLE,
+            "message": None,
+            "result": None,
+        }
+
+    # NOTE[agent]: Метод ставит операцию в очередь, если предыдущая уже завершилась.
+    def submit(self, operation: str, func: Callable[[], Any]) -> bool:
+        """Запускает операцию в фоне.
+
+        Args:
+            operation: Название операции для отображения статуса.
+            func: Вызываемый объект без аргументов, выполняющий операцию.
+
+        Returns:
+            True, если операция принята; False, если предыдущая ещё выполняется.
+        """
+
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return False
+            self._state = {
+                "operation": operation,
+                "status": self.STATUS_PENDING,
+                "message": None,
+                "result": None,
+            }
+            self._future = self._executor.submit(self._run, operation, func)
+        return True
+
+    # NOTE[agent]: Метод возвращает снимок состояния последней операции.
+    def status(self) -> Dict[str, Any]:
+        """Возвращает копию состояния последней операции."""
+
+        with self._lock:
+            return dict(self._state)
+
+    # NOTE[agent]: Выполняет операцию в контексте приложения и фиксирует результат.
+    def _run(self, operation: str, func: Callable[[], Any]) -> None:
+        """Выполняет операцию и сохраняет её итог в состоянии."""
+
+        with self._app.app_context():
+            try:
+                result = func()
+            except Exception as exc:  # pylint: disable=broad-except
+                self._app.logger.exception("Операция бота %s завершилась ошибкой", operation)
+                self._finish(self.STATUS_FAILED, message=str(exc))
+                return
+        self._finish(self.STATUS_DONE, result=result)
+
+    # NOTE[agent]: Атомарно обновляет состояние после завершения операции.
+    def _finish(self, status: str, *, message: Optional[str] = None, result: Any = None) -> None:
+        """Сохраняет статус завершённой операции."""
+
+        with self._lock:
+            self._state["status"] = status
+            self._state["message"] = message
+            self._state["result"] = result
@@ -6,13 +6,24 @@ from datetime import datetime
 from typing import Dict, Iterable, List, Optional, Tuple
 
 from telebot import types
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, bindparam, func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 
-from ..models import Dialog, MessageLog, ModelConfig, User, db
+from ..models import Dialog, MessageLog, ModelConfig, User, db, upsert_insert
 from .bot_modes import MODE_DEFINITIONS
 
 
+# NOTE[agent]: Запросы горячего пути собираются один раз при импорте и переиспользуются
+# с bind-параметрами, чтобы не строить Select на каждое обновление Telegram.
+_SELECT_USER_BY_TELEGRAM_ID = select(User).where(User.telegram_id == bindparam("telegram_id"))
+_SELECT_ACTIVE_DIALOG = (
+    select(Dialog)
+    .where(Dialog.user_id == bindparam("user_id"), Dialog.is_active.is_(True))
+    .order_by(Dialog.started_at.desc())
+    .limit(1)
+)
+
+
 class DialogManagementMixin:
     """Предоставляет методы для работы с пользователями, диалогами и LLM."""
 
@@ -67,13 +78,31 @@ class DialogManagementMixin:
         return keyboard
 
     # NOTE[agent]: Формирование клавиатуры истории диалогов.
-    def _build_history_keyboard(self, user: User, limit: int = 5) -> types.InlineKeyboardMarkup:
-        """Создаёт клавиатуру с последними диалогами пользователя."""
+    def _build_history_keyboard(
+        self,
+        user: User,
+        limit: int = 5,
+        dialogs: Optional[List[Dialog]] = None,
+    ) -> types.InlineKeyboardMarkup:
+        """Создаёт клавиатуру с последними диалогами пользователя.
+
+        Args:
+            user: Пользователь, чья история отображается.
+            limit: Максимальное число диалогов, если список не передан.
+            dialogs: Уже загруженные диалоги, чтобы не повторять запрос.
+
+        Returns:
+            Inline-клавиатура с кнопками переключения диалогов.
+        """
 
-        dialogs = self._get_recent_dialogs(user=user, limit=limit)
+        if dialogs is None:
+            dialogs = self._get_recent_dialogs(user=user, limit=limit)
+        first_messages = self._load_first_messages(
+            [dialog.id for dialog in dialogs if not self._clean_dialog_title(dialog)]
+        )
         keyboard = types.InlineKeyboardMarkup(row_width=1)
         for dialog in dialogs:
-            title = self._format_dialog_title(dialog)
+            title = self._format_dialog_title(dialog, first_messages=first_messages)
             if dialog.is_active:
                 title = f"✅ {title}"
             keyboard.add(
@@ -92,16 +121,17 @@ class DialogManagementMixin:
         """Ищет пользователя по Telegram ID и создаёт при отсутствии."""
 
         full_name = " ".join(filter(None, [telegram_user.first_name, telegram_user.last_name])) or None
-        user = User.query.filter_by(telegram_id=str(telegram_user.id)).first()
+        telegram_id = str(telegram_user.id)
+        user = db.session.scalar(_SELECT_USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id})
         if user:
-            if telegram_user.username and user.username != telegram_user.username:
-                user.username = telegram_user.username
-            if full_name and user.full_name != full_name:
-                user.full_name = full_name
-            db.session.commit()
+            if self._sync_user_profile(user, telegram_user.username, full_name):
+                db.session.commit()
             return user
+        upserted = self._upsert_user(telegram_id, telegram_user.username, full_name)
+        if upserted is not None:
+            return upserted
         user = User(
-            telegram_id=str(telegram_user.id),
+            telegram_id=telegram_id,
             username=telegram_user.username,
             full_name=full_name,
         )
@@ -110,21 +140,95 @@ class DialogManagementMixin:
             db.session.commit()
         except IntegrityError:
             db.session.rollback()
-            user = User.query.filter_by(telegram_id=str(telegram_user.id)).first()
+            user = db.session.scalar(_SELECT_USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id})
             if user is None:
                 raise
-            if telegram_user.username and user.username != telegram_user.username:
-                user.username = telegram_user.username
-            if full_name and user.full_name != full_name:
-                user.full_name = full_name
-            db.session.commit()
+            if self._sync_user_profile(user, telegram_user.username, full_name):
+                db.session.commit()
+        return user
+
+    # NOTE[agent]: Атомарно создаёт пользователя через INSERT ... ON CONFLICT DO UPDATE.
+    def _upsert_user(
+        self,
+        telegram_id: str,
+        username: Optional[str],
+        full_name: Optional[str],
+    ) -> Optional[User]:
+        """Создаёт пользователя или обновляет его профиль одним запросом.
+
+        Args:
+            telegram_id: Идентификатор пользователя в Telegram.
+            username: Username пользователя в Telegram.
+            full_name: Полное имя пользователя.
+
+        Returns:
+            Пользователь из базы данных или None, если диалект не поддерживает UPSERT.
+        """
+
+        stmt = upsert_insert(User)
+        if stmt is None:
+            return None
+        stmt = stmt.values(
+            telegram_id=telegram_id,
+            username=username,
+            full_name=full_name,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={
+                "username": func.coalesce(stmt.excluded.username, User.username),
+                "full_name": func.coalesce(stmt.excluded.full_name, User.full_name),
+            },
+        ).returning(User)
+        user = db.session.scalars(
+            stmt,
+            execution_options={"populate_existing": True},
+        ).one()
+        db.session.commit()
         return user
 
+    # NOTE[agent]: Отмечает активность пользователя без отдельной записи в БД.
+    def _record_user_activity(self, user: User) -> None:
+        """Передаёт отметку активности в буфер или обновляет модель напрямую."""
+
+        activity_buffer = getattr(self, "_activity_buffer", None)
+        if activity_buffer is None:
+            user.touch()
+            return
+        activity_buffer.record(user.id)
+
+    # NOTE[agent]: Обновляет профиль пользователя только при реальных изменениях.
+    def _sync_user_profile(
+        self,
+        user: User,
+        username: Optional[str],
+        full_name: Optional[str],
+    ) -> bool:
+        """Переносит username и полное имя из Telegram в модель пользователя.
+
+        Args:
+            user: Пользователь из базы данных.
+            username: Актуальный username в Telegram.
+            full_name: Актуальное полное имя в Telegram.
+
+        Returns:
+            True, если данные пользователя изменились и требуют сохранения.
+        """
+
+        changed = False
+        if username and user.username != username:
+            user.username = username
+            changed = True
+        if full_name and user.full_name != full_name:
+            user.full_name = full_name
+            changed = True
+        return changed
+
     # NOTE[agent]: Получение активного диалога пользователя.
     def _get_active_dialog(self, user: User) -> Optional[Dialog]:
         """Возвращает текущий активный диалог пользователя."""
 
-        return Dialog.query.filter_by(user_id=user.id, is_active=True).order_by(Dialog.started_at.desc()).first()
+        return db.session.scalar(_SELECT_ACTIVE_DIALOG, {"user_id": user.id})
 
     # NOTE[agent]: Возвращает последние диалоги пользователя.
     def _get_recent_dialogs(self, user: User, limit: int = 5) -> List[Dialog]:
@@ -160,36 +264,90 @@ class DialogManagementMixin:
     def _activate_dialog(self, user: User, dialog: Dialog) -> None:
         """Ставит указанный диалог активным и завершает остальные."""
 
-        active_dialogs = Dialog.query.filter_by(user_id=user.id, is_active=True).all()
-        for active in active_dialogs:
-            if active.id == dialog.id:
-                continue
-            active.is_active = False
-            active.ended_at = datetime.utcnow()
+        # NOTE[agent]: Остальные активные диалоги закрываются одним UPDATE без загрузки в ORM.
+        db.session.execute(
+            update(Dialog)
+            .where(
+                Dialog.user_id == user.id,
+                Dialog.is_active.is_(True),
+                Dialog.id != dialog.id,
+            )
+            .values(is_active=False, ended_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
         dialog.is_active = True
         dialog.ended_at = None
         db.session.commit()
 
     # NOTE[agent]: Возвращает краткое название диалога.
-    def _format_dialog_title(self, dialog: Dialog) -> str:
-        """Формирует текстовое название диалога для кнопок истории."""
+    def _format_dialog_title(
+        self,
+        dialog: Dialog,
+        first_messages: Optional[Dict[int, str]] = None,
+    ) -> str:
+        """Формирует текстовое название диалога для кнопок истории.
 
-        base_title = (dialog.title or "").strip()
-        placeholder_titles = {"диалог", "новый диалог", "dialog", "new dialog"}
-        if base_title and base_title.lower() in placeholder_titles:
-            base_title = ""
+        Args:
+            dialog: Диалог, для которого требуется название.
+            first_messages: Предзагруженные первые сообщения диалогов по их id.
+
+        Returns:
+            Название длиной не более 40 символов.
+        """
+
+        base_title = self._clean_dialog_title(dialog)
         if not base_title:
-            first_log = (
-                MessageLog.query.filter_by(dialog_id=dialog.id)
-                .order_by(MessageLog.message_index.asc())
-                .first()
-            )
-            base_title = (first_log.user_message if first_log else f"Диалог #{dialog.id}") or ""
+            if first_messages is None:
+                first_messages = self._load_first_messages([dialog.id])
+            base_title = first_messages.get(dialog.id, f"Диалог #{dialog.id}") or ""
         prepared = " ".join(base_title.split())
         if len(prepared) > 40:
             prepared = f"{prepared[:40]}…"
         return prepared or f"Диалог #{dialog.id}"
 
+    # NOTE[agent]: Отбрасывает шаблонные заголовки, не несущие смысла.
+    def _clean_dialog_title(self, dialog: Dialog) -> str:
+        """Возвращает заголовок диалога или пустую строку для шаблонных названий."""
+
+        base_title = (dialog.title or "").strip()
+        placeholder_titles = {"диалог", "новый диалог", "dialog", "new dialog"}
+        if base_title and base_title.lower() in placeholder_titles:
+            return ""
+        return base_title
+
+    # NOTE[agent]: Загружает первые сообщения нескольких диалогов одним запросом.
+    def _load_first_messages(self, dialog_ids: List[int]) -> Dict[int, str]:
+        """Возвращает первое сообщение пользователя для каждого из диалогов.
+
+        Args:
+            dialog_ids: Идентификаторы диалогов.
+
+        Returns:
+            Словарь «id диалога → текст первого сообщения».
+        """
+
+        if not dialog_ids:
+            return {}
+        first_index = (
+            select(
+                MessageLog.dialog_id.label("dialog_id"),
+                func.min(MessageLog.message_index).label("message_index"),
+            )
+            .where(MessageLog.dialog_id.in_(dialog_ids))
+            .group_by(MessageLog.dialog_id)
+            .subquery()
+        )
+        rows = db.session.execute(
+            select(MessageLog.dialog_id, MessageLog.user_message).join(
+                first_index,
+                and_(
+                    MessageLog.dialog_id == first_index.c.dialog_id,
+                    MessageLog.message_index == first_index.c.message_index,
+                ),
+            )
+        )
+        return {dialog_id: user_message for dialog_id, user_message in rows}
+
     # NOTE[agent]: Подсчитывает накопленное использование токенов.
     def _calculate_dialog_usage(
         self,
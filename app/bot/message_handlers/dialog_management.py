@@ -5,6 +5,7 @@ from __future__ import annotations
 from html import escape as html_escape
 from typing import Optional
 
+from sqlalchemy import select
 from telebot import types
 
 from ...models import Dialog, MessageLog, db
@@ -62,27 +63,27 @@ class DialogHistoryHandlersMixin:
 
         if not self._bot:
             return
-        previous_responses = (
-            MessageLog.query.filter(
+        # NOTE[agent]: Нужны только идентификаторы сообщений Telegram, тексты логов
+        # не загружаются и ORM-объекты не создаются.
+        assistant_message_ids = db.session.scalars(
+            select(MessageLog.assistant_message_id)
+            .where(
                 MessageLog.dialog_id == dialog.id,
                 MessageLog.assistant_message_id.isnot(None),
             )
             .order_by(MessageLog.message_index.asc())
-            .all()
-        )
-        for log_entry in previous_responses:
-            if not log_entry.assistant_message_id:
-                continue
+        ).all()
+        for assistant_message_id in assistant_message_ids:
             try:
                 self._bot.edit_message_reply_markup(
                     chat_id=chat_id,
-                    message_id=log_entry.assistant_message_id,
+                    message_id=assistant_message_id,
                     reply_markup=None,
                 )
             except Exception:  # pylint: disable=broad-except
                 self._get_logger().debug(
                     "🚫 Не удалось удалить клавиатуру у сообщения %s",
-                    log_entry.assistant_message_id,
+                    assistant_message_id,
                     exc_info=True,
                 )
 
@@ -173,7 +174,7 @@ _Можете использовать шаблон промпта для удо
         if not dialogs:
             self._bot.answer_callback_query(call.id, text="📖 История пуста")
             return
-        history_keyboard = self._build_history_keyboard(user)
+        history_keyboard = self._build_history_keyboard(user, dialogs=dialogs)
         self._bot.answer_callback_query(call.id)
         chat_id = call.message.chat.id if call.message else call.from_user.id
         self._forget_history_message(chat_id)
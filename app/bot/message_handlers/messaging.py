@@ -6,6 +6,7 @@ import threading
 from html import escape as html_escape
 from typing import Any, List, Optional
 
+from sqlalchemy import func, select
 from telebot import types
 
 from ...models import Dialog, MessageLog, db
@@ -33,6 +34,7 @@ class MessagingMixin:
             return
 
         dialog = self._get_active_dialog(user)
+        message_index = 1
         if not dialog:
             dialog = Dialog(
                 user_id=user.id,
@@ -40,11 +42,17 @@ class MessagingMixin:
                 telegram_chat_id=str(message.chat.id),
             )
             db.session.add(dialog)
-            db.session.commit()
-        elif not dialog.telegram_chat_id:
-            dialog.telegram_chat_id = str(message.chat.id)
-
-        message_index = MessageLog.query.filter_by(dialog_id=dialog.id).count() + 1
+            # NOTE[agent]: flush выдаёт id диалога; фиксация произойдёт вместе с записью лога.
+            db.session.flush()
+        else:
+            if not dialog.telegram_chat_id:
+                dialog.telegram_chat_id = str(message.chat.id)
+            # NOTE[agent]: MAX по индексу (dialog_id, message_index) читает одну запись
+            # индекса вместо подсчёта всех сообщений диалога.
+            last_index = db.session.scalar(
+                select(func.max(MessageLog.message_index)).where(MessageLog.dialog_id == dialog.id)
+            )
+            message_index = (last_index or 0) + 1
         log_entry = MessageLog(
             dialog_id=dialog.id,
             user_id=user.id,
@@ -54,7 +62,7 @@ class MessagingMixin:
             user_message_id=message.message_id,
         )
         db.session.add(log_entry)
-        user.touch()
+        self._record_user_activity(user)
         if message_index == 1 and message.text:
             dialog.title = " ".join(message.text.split())[:255]
         db.session.commit()
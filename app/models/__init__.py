@@ -1,6 +1,10 @@
 """Модели базы данных приложения."""
 
+from typing import Any, Optional
+
 from sqlalchemy import MetaData
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from flask_sqlalchemy import SQLAlchemy
 
 # NOTE[agent]: Чтобы Alembic всегда генерил имена ограничений/индексов предсказуемо
@@ -15,6 +19,29 @@ metadata = MetaData(naming_convention=convention)
 # NOTE[agent]: Экземпляр SQLAlchemy используется всеми моделями.
 db = SQLAlchemy()
 
+# NOTE[agent]: Конструкторы INSERT с поддержкой ON CONFLICT по диалектам СУБД.
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+# NOTE[agent]: Общая точка выбора INSERT ... ON CONFLICT для всех пакетных записей.
+def upsert_insert(model: Any) -> Optional[Any]:
+    """Возвращает INSERT с поддержкой ON CONFLICT для диалекта текущей сессии.
+
+    Args:
+        model: ORM-модель, в таблицу которой выполняется вставка.
+
+    Returns:
+        Конструкция INSERT диалекта либо None, если диалект не поддерживает UPSERT.
+    """
+
+    insert_factory = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if insert_factory is None:
+        return None
+    return insert_factory(model)
+
 # NOTE[agent]: Импорты моделей размещаются в конце файла, чтобы избежать циклов.
 from .user import User  # noqa: E402  pylint: disable=wrong-import-position
 from .dialog import Dialog  # noqa: E402  pylint: disable=wrong-import-position
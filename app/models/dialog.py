@@ -19,6 +19,21 @@ class Dialog(db.Model):
     ended_at = db.Column(db.DateTime, nullable=True)
     telegram_chat_id = db.Column(db.String(64), nullable=True)
 
+    # NOTE[agent]: Частичный индекс по активным диалогам повторяет фильтр и сортировку
+    # поиска активного диалога, а также используется при массовом закрытии.
+    __table_args__ = (
+        db.Index(
+            "ix_dialogs__user_id__active",
+            user_id,
+            started_at.desc(),
+            postgresql_where=is_active.is_(True),
+            postgresql_include=["id", "title"],
+            sqlite_where=is_active.is_(True),
+        ),
+        # NOTE[agent]: Индекс обслуживает keyset-пагинацию списка диалогов в журнале.
+        db.Index("ix_dialogs__started_at", started_at, id),
+    )
+
     messages = db.relationship("MessageLog", backref="dialog", lazy=True)
 
     # NOTE[agent]: Метод завершает диалог и фиксирует время окончания.
@@ -27,6 +27,24 @@ class MessageLog(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     responded_at = db.Column(db.DateTime, nullable=True)
 
+    # NOTE[agent]: Индексы под выборку сообщений диалога по порядку и статистику за период.
+    __table_args__ = (
+        # NOTE[agent]: INCLUDE позволяет PostgreSQL считать статистику диалогов в журнале
+        # только по индексу, без чтения строк с полными текстами сообщений.
+        db.Index(
+            "ix_message_logs__dialog_id__message_index",
+            dialog_id,
+            message_index.desc(),
+            postgresql_include=["id", "tokens_used", "prompt_tokens", "completion_tokens"],
+        ),
+        db.Index(
+            "ix_message_logs__created_at",
+            created_at,
+            id,
+            postgresql_include=["tokens_used"],
+        ),
+    )
+
     model = db.relationship("ModelConfig")
 
     # NOTE[agent]: Метод обновляет данные о полученном ответе от LLM.
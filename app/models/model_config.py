@@ -25,6 +25,23 @@ class ModelConfig(db.Model):
     dialog_token_limit = db.Column(db.Integer, default=20000, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    # NOTE[agent]: Уникальный частичный индекс допускает лишь одну модель по умолчанию
+    # и позволяет сбрасывать флаг, затрагивая только эту строку. Каталога миграций в
+    # проекте нет: ревизию создаёт flask db migrate, и перед upgrade в существующей базе
+    # нужно оставить флаг только у самой новой модели, иначе создание индекса упадёт:
+    #   UPDATE model_configs SET is_default = false WHERE is_default AND id <> (
+    #       SELECT id FROM model_configs WHERE is_default
+    #       ORDER BY created_at DESC, id DESC LIMIT 1);
+    __table_args__ = (
+        db.Index(
+            "ux_model_configs__is_default",
+            is_default,
+            unique=True,
+            postgresql_where=is_default.is_(True),
+            sqlite_where=is_default.is_(True),
+        ),
+    )
+
     provider = db.relationship("LLMProvider", back_populates="models")
 
     # NOTE[agent]: Метод возвращает словарь параметров для OpenAI API.
@@ -1,7 +1,8 @@
 """Поставщики API для LLM."""
 
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
 from . import db
 
@@ -29,23 +30,29 @@ class LLMProvider(db.Model):
     VENDOR_GOOGLE = "google"
     VENDOR_GROQ = "groq"
 
+    # NOTE[agent]: Справочники поставщиков статичны, поэтому строятся один раз при импорте.
+    _ALLOWED_VENDORS: Tuple[str, ...] = (VENDOR_OPENAI, VENDOR_GOOGLE, VENDOR_GROQ)
+    _VENDOR_TITLES: Mapping[str, str] = MappingProxyType(
+        {
+            VENDOR_OPENAI: "OpenAI",
+            VENDOR_GOOGLE: "Google",
+            VENDOR_GROQ: "Groq",
+        }
+    )
+
     # NOTE[agent]: Метод предоставляет перечень допустимых поставщиков.
     @classmethod
     def allowed_vendors(cls) -> Tuple[str, ...]:
         """Возвращает поддерживаемых поставщиков API."""
 
-        return (cls.VENDOR_OPENAI, cls.VENDOR_GOOGLE, cls.VENDOR_GROQ)
+        return cls._ALLOWED_VENDORS
 
     # NOTE[agent]: Метод сопоставляет внутренние идентификаторы и отображаемые названия.
     @classmethod
-    def vendor_titles(cls) -> Dict[str, str]:
-        """Возвращает словарь для отображения названий поставщиков."""
+    def vendor_titles(cls) -> Mapping[str, str]:
+        """Возвращает неизменяемый словарь для отображения названий поставщиков."""
 
-        return {
-            cls.VENDOR_OPENAI: "OpenAI",
-            cls.VENDOR_GOOGLE: "Google",
-            cls.VENDOR_GROQ: "Groq",
-        }
+        return cls._VENDOR_TITLES
 
     # NOTE[agent]: Метод обновляет данные поставщика и сбрасывает кэш клиентов.
     def update_credentials(
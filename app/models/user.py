@@ -33,6 +33,17 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     last_active_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    # NOTE[agent]: Индексы под сортировку списка в админке и подсчёт активных пользователей.
+    __table_args__ = (
+        db.Index(
+            "ix_users__created_at",
+            created_at.desc(),
+            id.desc(),
+            postgresql_include=["telegram_id", "username", "full_name", "is_active"],
+        ),
+        db.Index("ix_users__last_active_at", last_active_at),
+    )
+
     dialogs = db.relationship("Dialog", backref="user", lazy=True)
     messages = db.relationship("MessageLog", backref="user", lazy=True)
 
@@ -2,14 +2,31 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
 from urllib.parse import urlparse
 
+from cachetools import TTLCache
 from flask import current_app
+from sqlalchemy import event, select
 
-from ..models import AppSetting, db
+from ..models import AppSetting, db, upsert_insert
 
 
+# NOTE[agent]: Маркер отсутствующей настройки.
+_MISSING = object()
+
+# NOTE[agent]: Процессный кеш снимка всех настроек; сбрасывается при записи через set().
+_SETTINGS_CACHE: TTLCache = TTLCache(maxsize=1, ttl=60)
+_SETTINGS_CACHE_LOCK = threading.Lock()
+# NOTE[agent]: Ключ кеша для полного словаря настроек и его версии.
+_ALL_SETTINGS_CACHE_KEY = "__all__"
+# NOTE[agent]: Поколение кеша растёт при каждом сбросе; снимок, прочитанный до сброса,
+# не сохраняется поверх новых данных.
+_SETTINGS_CACHE_GENERATION = 0
+
 # NOTE[agent]: Класс инкапсулирует всю работу с таблицей настроек.
 class SettingsService:
     """Сервисный класс для чтения и изменения настроек."""
@@ -29,25 +46,73 @@ class SettingsService:
             Строковое значение настройки или default.
         """
 
-        setting = AppSetting.query.filter_by(key=key).first()
-        if setting:
-            return setting.value or ""
+        value = self._get_cached_value(key)
+        if value is not _MISSING:
+            return value or ""
         if default is not None:
             return default
         current_app.logger.warning("Настройка %s не найдена", key)
         return ""
 
     # NOTE[agent]: Метод сохраняет новое значение настройки.
-    def set(self, key: str, value: Any) -> None:
-        """Сохраняет значение настройки."""
+    def set(self, key: str, value: Any, *, commit: bool = True) -> None:
+        """Сохраняет значение настройки.
+
+        Args:
+            key: Ключ настройки.
+            value: Новое значение настройки.
+            commit: Фиксировать ли транзакцию; False позволяет записать настройку
+                вместе с другими изменениями вызывающего кода.
+        """
+
+        self._stage_value(key, value)
+        if commit:
+            db.session.commit()
+            self._invalidate_cache()
+        else:
+            # NOTE[agent]: Снимок сбрасывается только после фиксации вызывающим кодом,
+            # иначе параллельный читатель успеет закешировать старое значение.
+            self._invalidate_cache_on_transaction_end()
+
+    # NOTE[agent]: Метод сохраняет несколько настроек одним запросом и одной транзакцией.
+    def set_many(self, values: Mapping[str, Any]) -> None:
+        """Сохраняет набор настроек через INSERT ... ON CONFLICT DO UPDATE.
+
+        Args:
+            values: Соответствие ключей настроек и их новых значений.
+        """
+
+        if not values:
+            return
+        stmt = upsert_insert(AppSetting)
+        if stmt is None:
+            for key, value in values.items():
+                self._stage_value(key, value)
+        else:
+            now = datetime.utcnow()
+            stmt = stmt.values(
+                [
+                    {"key": key, "value": str(value), "updated_at": now}
+                    for key, value in values.items()
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AppSetting.key],
+                set_={"value": stmt.excluded.value, "updated_at": stmt.excluded.updated_at},
+            )
+            db.session.execute(stmt)
+        db.session.commit()
+        self._invalidate_cache()
+
+    # NOTE[agent]: Метод добавляет или изменяет настройку в текущей сессии без фиксации.
+    def _stage_value(self, key: str, value: Any) -> None:
+        """Подготавливает запись настройки в сессии SQLAlchemy."""
 
         setting = AppSetting.query.filter_by(key=key).first()
         if not setting:
-            setting = AppSetting(key=key, value=str(value))
-            db.session.add(setting)
+            db.session.add(AppSetting(key=key, value=str(value)))
         else:
             setting.update_value(str(value))
-        db.session.commit()
 
     # NOTE[agent]: Метод возвращает целочисленное значение настройки.
     def get_int(self, key: str, default: Optional[int] = None) -> Optional[int]:
@@ -61,19 +126,60 @@ class SettingsService:
             Целочисленное значение настройки или default, если преобразование невозможно.
         """
 
-        setting = AppSetting.query.filter_by(key=key).first()
-        if not setting or setting.value is None or setting.value == "":
+        value = self._get_cached_value(key)
+        if value is _MISSING or value is None or value == "":
             return default
         try:
-            return int(setting.value)
+            return int(value)
         except (TypeError, ValueError):
             current_app.logger.warning(
                 "Настройка %s имеет некорректное числовое значение: %s",
                 key,
-                setting.value,
+                value,
             )
             return default
 
+    # NOTE[agent]: Метод читает значение настройки из кешированного снимка всех настроек.
+    def _get_cached_value(self, key: str) -> Any:
+        """Возвращает значение настройки из процессного кеша.
+
+        Таблица настроек небольшая, поэтому при промахе кеша она читается целиком
+        одним запросом, и все последующие ключи берутся из словаря.
+
+        Args:
+            key: Ключ настройки.
+
+        Returns:
+            Строковое значение настройки либо маркер _MISSING, если записи нет.
+        """
+
+        settings, _ = self._get_all_settings_snapshot()
+        return settings.get(key, _MISSING)
+
+    # NOTE[agent]: Метод сбрасывает кешированный снимок после записи настроек.
+    @staticmethod
+    def _invalidate_cache() -> None:
+        """Удаляет снимок настроек из процессного кеша."""
+
+        global _SETTINGS_CACHE_GENERATION  # pylint: disable=global-statement
+        with _SETTINGS_CACHE_LOCK:
+            _SETTINGS_CACHE_GENERATION += 1
+            _SETTINGS_CACHE.pop(_ALL_SETTINGS_CACHE_KEY, None)
+
+    # NOTE[agent]: Метод откладывает сброс снимка до завершения транзакции текущей сессии.
+    @staticmethod
+    def _invalidate_cache_on_transaction_end() -> None:
+        """Подписывает сброс кеша на фиксацию или откат транзакции сессии.
+
+        Откат тоже сбрасывает снимок: чтение в той же сессии после autoflush
+        могло закешировать незафиксированное значение.
+        """
+
+        session = db.session()
+        for event_name in ("after_commit", "after_rollback"):
+            if not event.contains(session, event_name, _invalidate_settings_cache):
+                event.listen(session, event_name, _invalidate_settings_cache)
+
     def get_webhook_path(self, *, fallback: str = "/bot/webhook") -> str:
         """Возвращает относительный путь webhook с учётом настроек."""
 
@@ -93,5 +199,49 @@ class SettingsService:
     def all_settings(self) -> Dict[str, str]:
         """Возвращает все настройки в виде словаря."""
 
-        items = AppSetting.query.all()
-        return {item.key: item.value or "" for item in items}
+        settings, _ = self._get_all_settings_snapshot()
+        # NOTE[agent]: Вызывающий код получает копию, чтобы не изменить кешированный словарь.
+        return dict(settings)
+
+    # NOTE[agent]: Метод возвращает настройки вместе с версией для HTTP-валидации кеша.
+    def settings_snapshot(self) -> Tuple[Dict[str, str], str]:
+        """Возвращает копию всех настроек и хеш этого набора.
+
+        Версия вычисляется при заполнении кеша и меняется вместе с ним, поэтому
+        её проверка не требует повторной сериализации настроек.
+        """
+
+        settings, version = self._get_all_settings_snapshot()
+        return dict(settings), version
+
+    # NOTE[agent]: Метод читает словарь настроек и его версию через общий TTL-кеш.
+    def _get_all_settings_snapshot(self) -> Tuple[Dict[str, str], str]:
+        """Возвращает кешированный словарь всех настроек и его хеш."""
+
+        with _SETTINGS_CACHE_LOCK:
+            cached = _SETTINGS_CACHE.get(_ALL_SETTINGS_CACHE_KEY)
+            generation = _SETTINGS_CACHE_GENERATION
+        if cached is None:
+            # NOTE[agent]: Читаем только пары ключ/значение, минуя создание ORM-объектов.
+            rows = db.session.execute(select(AppSetting.key, AppSetting.value))
+            settings = {key: value or "" for key, value in rows}
+            digest = hashlib.blake2b(digest_size=12)
+            for key in sorted(settings):
+                digest.update(key.encode())
+                digest.update(b"\0")
+                digest.update(settings[key].encode())
+                digest.update(b"\0")
+            cached = (settings, digest.hexdigest())
+            with _SETTINGS_CACHE_LOCK:
+                # NOTE[agent]: Если во время чтения прошла запись, снимок возвращается
+                # вызывающему коду, но не кешируется.
+                if generation == _SETTINGS_CACHE_GENERATION:
+                    _SETTINGS_CACHE[_ALL_SETTINGS_CACHE_KEY] = cached
+        return cached
+
+
+# NOTE[agent]: Обработчик событий сессии SQLAlchemy для отложенного сброса снимка настроек.
+def _invalidate_settings_cache(session: Any) -> None:
+    """Сбрасывает снимок настроек после завершения транзакции сессии."""
+
+    SettingsService._invalidate_cache()  # pylint: disable=protected-access
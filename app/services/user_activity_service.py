@@ -0,0 +1,149 @@
+"""Буферизация отметок активности пользователей бота."""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, Optional
+
+from flask import Flask
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..models import User, db
+
+
+# NOTE[agent]: Запущенные буферы процесса; слабые ссылки не удерживают буфер и его
+# приложение, а единственный обработчик atexit сохраняет остаток каждого из них.
+_ACTIVE_BUFFERS: "weakref.WeakSet[UserActivityBuffer]" = weakref.WeakSet()
+_ACTIVE_BUFFERS_LOCK = threading.Lock()
+
+
+# NOTE[agent]: Класс накапливает время активности и пишет его в БД пачками.
+class UserActivityBuffer:
+    """Копит отметки last_active_at и периодически сохраняет их одним запросом."""
+
+    def __init__(self, flush_interval: float = 5.0) -> None:
+        """Подготавливает пустой буфер.
+
+        Args:
+            flush_interval: Период (в секундах) между фоновыми сбросами буфера.
+        """
+
+        self._flush_interval = flush_interval
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app: Optional[Flask] = None
+
+    # NOTE[agent]: Метод фиксирует активность без обращения к базе данных.
+    def record(self, user_id: int, moment: Optional[datetime] = None) -> None:
+        """Запоминает время последней активности пользователя.
+
+        Args:
+            user_id: Идентификатор пользователя в базе данных.
+            moment: Время активности; по умолчанию текущее время UTC.
+        """
+
+        with self._lock:
+            self._pending[user_id] = moment or datetime.utcnow()
+
+    # NOTE[agent]: Метод сохраняет накопленные отметки одним executemany-UPDATE.
+    def flush(self) -> int:
+        """Записывает накопленные отметки активности в базу данных.
+
+        Требует активного контекста приложения Flask.
+
+        Returns:
+            Количество обновлённых пользователей.
+        """
+
+        with self._lock:
+            if not self._pending:
+                return 0
+            snapshot = self._pending
+            self._pending = {}
+        users_table = User.__table__
+        stmt = (
+            update(users_table)
+            .where(users_table.c.id == bindparam("user_id"))
+            .values(last_active_at=bindparam("seen_at"))
+        )
+        rows = [{"user_id": user_id, "seen_at": seen_at} for user_id, seen_at in snapshot.items()]
+        try:
+            db.session.execute(stmt, rows)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            # NOTE[agent]: Возвращаем отметки в буфер, не перетирая более свежие значения.
+            with self._lock:
+                for user_id, seen_at in snapshot.items():
+                    self._pending.setdefault(user_id, seen_at)
+            raise
+        return len(rows)
+
+    # NOTE[agent]: Метод запускает фоновый поток периодического сброса.
+    def start(self, app: Flask) -> None:
+        """Запускает фоновый сброс буфера для указанного приложения."""
+
+        self._app = app
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._flush_loop,
+            name="user-activity-flush",
+            daemon=True,
+        )
+        self._thread.start()
+        with _ACTIVE_BUFFERS_LOCK:
+            _ACTIVE_BUFFERS.add(self)
+
+    # NOTE[agent]: Метод останавливает фоновый поток и сбрасывает остаток буфера.
+    def stop(self) -> None:
+        """Останавливает фоновый сброс и сохраняет оставшиеся отметки."""
+
+        self._stop_event.set()
+        with _ACTIVE_BUFFERS_LOCK:
+            _ACTIVE_BUFFERS.discard(self)
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=self._flush_interval)
+        self._thread = None
+        self._flush_in_app_context()
+
+    # NOTE[agent]: Цикл фонового потока.
+    def _flush_loop(self) -> None:
+        """Периодически сбрасывает буфер, пока не запрошена остановка."""
+
+        while not self._stop_event.wait(self._flush_interval):
+            self._flush_in_app_context()
+
+    # NOTE[agent]: Сброс буфера в контексте сохранённого приложения.
+    def _flush_in_app_context(self) -> None:
+        """Выполняет flush() внутри контекста приложения с логированием ошибок."""
+
+        app = self._app
+        if app is None:
+            return
+        with app.app_context():
+            try:
+                self.flush()
+            except SQLAlchemyError:
+                app.logger.exception("Не удалось сохранить активность пользователей")
+
+
+# NOTE[agent]: Обработчик завершения процесса регистрируется один раз при импорте модуля.
+def _stop_active_buffers() -> None:
+    """Останавливает все запущенные буферы и сохраняет их отметки."""
+
+    with _ACTIVE_BUFFERS_LOCK:
+        buffers = list(_ACTIVE_BUFFERS)
+    for activity_buffer in buffers:
+        activity_buffer.stop()
+
+
+atexit.register(_stop_active_buffers)
@@ -1,6 +1,6 @@
 """Пакет с веб-интерфейсами приложения."""
 
-# NOTE[agent]: Экспортируем blueprint админки для удобного импорта.
-from .admin import admin_bp
+# NOTE[agent]: Экспортируем blueprint админки и функцию его подключения.
+from .admin import admin_bp, register_admin_blueprint
 
-__all__ = ["admin_bp"]
+__all__ = ["admin_bp", "register_admin_blueprint"]
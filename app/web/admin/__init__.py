@@ -3,29 +3,38 @@
 from __future__ import annotations
 
 from typing import Optional
-from urllib.parse import urlparse
 
-from flask import Blueprint, Response, redirect, request, session, url_for
+from flask import Blueprint, Flask, Response, jsonify, redirect, request, session, url_for
 
 
-admin_bp = Blueprint("admin", __name__, url_prefix="/admin", template_folder="../templates")
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
 
 # NOTE[agent]: Ключ сессии, сигнализирующий об авторизованном администраторе.
 ADMIN_SESSION_KEY = "admin_authenticated"
 
+# NOTE[agent]: Эндпоинты админки, доступные без авторизации.
+_PUBLIC_ENDPOINTS = frozenset({"admin.login", "admin.logout"})
+
+# NOTE[agent]: JSON-эндпоинты вне /api, которым без авторизации нужен ответ 401.
+_JSON_ENDPOINTS = frozenset({"admin.message_full_text"})
+
 
 # NOTE[agent]: Обработчик проверяет доступ к маршрутам админ-панели.
 @admin_bp.before_request
 def ensure_authenticated() -> Optional[Response]:
     """Перенаправляет неавторизованных пользователей на форму входа."""
 
-    endpoint = request.endpoint or ""
-    if endpoint.endswith("login") or endpoint.endswith("logout"):
+    if request.endpoint in _PUBLIC_ENDPOINTS or _is_admin_authenticated():
         return None
-    if _is_admin_authenticated():
-        return None
-    next_url = request.url
+    # NOTE[agent]: JSON API отвечает 401 без редиректа на HTML-форму входа,
+    # чтобы опрашивающие клиенты не загружали страницу логина.
+    endpoint = request.endpoint or ""
+    if endpoint.startswith("admin.api_") or endpoint in _JSON_ENDPOINTS:
+        return jsonify({"status": "error", "message": "Unauthorized"}), 401
+    # NOTE[agent]: Передаётся относительный путь: абсолютный request.url отклонялся
+    # проверкой _safe_next_url, и после входа всегда открывался дашборд.
+    next_url = request.full_path if request.query_string else request.path
     return redirect(url_for("admin.login", next=next_url))
 
 
@@ -40,17 +49,39 @@ def _is_admin_authenticated() -> bool:
 def _safe_next_url(next_url: Optional[str]) -> str:
     """Возвращает безопасный относительный URL для перенаправления."""
 
-    default_url = url_for("admin.dashboard")
-    if not next_url:
-        return default_url
-    parsed = urlparse(next_url)
-    if parsed.scheme or parsed.netloc:
-        return default_url
-    if not parsed.path.startswith("/admin"):
-        return default_url
-    return next_url
+    # NOTE[agent]: Строка, начинающаяся с "/admin", не содержит ни схемы, ни хоста,
+    # поэтому разбор через urlparse не требуется.
+    if next_url and next_url.startswith("/admin"):
+        return next_url
+    return url_for("admin.dashboard")
+
+
+# NOTE[agent]: Единственная точка подключения админки к приложению.
+def register_admin_blueprint(app: Flask) -> None:
+    """Загружает модули маршрутов и регистрирует blueprint админки.
+
+    Модули маршрутов импортируются один раз за процесс, поэтому повторный
+    вызов для нового приложения не дублирует правила blueprint.
+
+    Args:
+        app: Приложение Flask, к которому подключается админка.
+    """
+
+    from . import (  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+        api,
+        auth,
+        commands,
+        dashboard,
+        dialogs,
+        logs,
+        models,
+        page_cache,
+        providers,
+        settings,
+        users,
+    )
 
+    app.register_blueprint(admin_bp)
 
-from . import api, auth, commands, dashboard, dialogs, logs, models, providers, settings, users  # noqa: E402,F401
 
-__all__ = ["admin_bp"]
+__all__ = ["admin_bp", "register_admin_blueprint"]
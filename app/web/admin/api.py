@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from flask import Response, current_app, jsonify, request
 
-from ...bot.bot_service import PollingStopTimeoutError, TelegramBotManager
+from ...bot.bot_service import TelegramBotManager
+from ...bot.bot_tasks import BotTaskRunner
 from ...services.settings_service import SettingsService
 from . import admin_bp
 
@@ -18,65 +19,98 @@ def api_settings() -> Response:
 
     settings_service = SettingsService()
     if request.method == "GET":
-        return jsonify(settings_service.all_settings())
+        # NOTE[agent]: Неизменившиеся настройки подтверждаются ответом 304 без тела.
+        settings, version = settings_service.settings_snapshot()
+        if request.if_none_match.contains_weak(version):
+            response = Response(status=304)
+        else:
+            response = jsonify(settings)
+        response.set_etag(version, weak=True)
+        response.headers["Cache-Control"] = "private, must-revalidate"
+        return response
     payload: Dict[str, Any] = request.get_json(silent=True) or {}
-    for key, value in payload.items():
-        settings_service.set(key, value)
+    # NOTE[agent]: Весь набор ключей сохраняется одним UPSERT и одной фиксацией.
+    settings_service.set_many(payload)
     return jsonify({"status": "ok"})
 
 
 # NOTE[agent]: API-метод запуска бота в режиме polling.
 @admin_bp.route("/api/bot/start-polling", methods=["POST"])
 def api_start_polling() -> Response:
-    """Запускает бота в режиме polling."""
+    """Ставит запуск бота в режиме polling в фоновую очередь."""
 
     bot_manager: Optional[TelegramBotManager] = current_app.extensions.get("bot_manager")  # type: ignore[assignment]
     if not bot_manager:
         return jsonify({"status": "error", "message": "Bot manager is not configured"}), 500
-    try:
-        bot_manager.start_polling()
-    except Exception as exc:  # pylint: disable=broad-except
-        current_app.logger.exception("Не удалось запустить polling")
-        return jsonify({"status": "error", "message": str(exc)}), 400
-    return jsonify({"status": "ok"})
+    return _submit_bot_operation("start_polling", bot_manager.start_polling)
 
 
 # NOTE[agent]: API-метод запуска webhook.
 @admin_bp.route("/api/bot/start-webhook", methods=["POST"])
 def api_start_webhook() -> Response:
-    """Устанавливает webhook для Telegram."""
+    """Ставит установку webhook для Telegram в фоновую очередь."""
 
     bot_manager: Optional[TelegramBotManager] = current_app.extensions.get("bot_manager")  # type: ignore[assignment]
     if not bot_manager:
         return jsonify({"status": "error", "message": "Bot manager is not configured"}), 500
-    try:
-        url = bot_manager.start_webhook()
-    except Exception as exc:  # pylint: disable=broad-except
-        current_app.logger.exception("Не удалось установить webhook")
-        return jsonify({"status": "error", "message": str(exc)}), 400
-    return jsonify({"status": "ok", "webhook_url": url})
+    return _submit_bot_operation("start_webhook", bot_manager.start_webhook)
 
 
 # NOTE[agent]: API-метод остановки бота.
 @admin_bp.route("/api/bot/stop", methods=["POST"])
 def api_stop_bot() -> Response:
-    """Останавливает polling Telegram-бота."""
+    """Ставит остановку polling Telegram-бота в фоновую очередь."""
 
     bot_manager: Optional[TelegramBotManager] = current_app.extensions.get("bot_manager")  # type: ignore[assignment]
     if not bot_manager:
         return jsonify({"status": "error", "message": "Bot manager is not configured"}), 500
-    try:
-        bot_manager.stop()
-    except PollingStopTimeoutError as exc:
-        current_app.logger.exception("Не удалось остановить polling вовремя")
+    return _submit_bot_operation("stop", bot_manager.stop)
+
+
+# NOTE[agent]: API-метод возвращает состояние бота и последней фоновой операции.
+@admin_bp.route("/api/bot/status", methods=["GET"])
+def api_bot_status() -> Response:
+    """Сообщает, запущен ли бот и чем завершилась последняя операция."""
+
+    bot_manager: Optional[TelegramBotManager] = current_app.extensions.get("bot_manager")  # type: ignore[assignment]
+    bot_tasks: Optional[BotTaskRunner] = current_app.extensions.get("bot_tasks")  # type: ignore[assignment]
+    if not bot_manager or not bot_tasks:
+        return jsonify({"status": "error", "message": "Bot manager is not configured"}), 500
+    response = jsonify({
+        "status": "ok",
+        "running": bot_manager.is_running(),
+        "task": bot_tasks.status(),
+    })
+    # NOTE[agent]: Опрос без изменений состояния получает 304 без тела.
+    response.add_etag(weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
+# NOTE[agent]: Вспомогательная функция ставит операцию бота в очередь и отвечает 202.
+def _submit_bot_operation(operation: str, func: Callable[[], Any]) -> Response:
+    """Передаёт операцию фоновому исполнителю и формирует ответ API.
+
+    Args:
+        operation: Название операции для статуса.
+        func: Метод менеджера бота, который нужно выполнить.
+
+    Returns:
+        Ответ 202 при постановке в очередь или ошибку, если исполнитель занят.
+    """
+
+    bot_tasks: Optional[BotTaskRunner] = current_app.extensions.get("bot_tasks")  # type: ignore[assignment]
+    if not bot_tasks:
+        return jsonify({"status": "error", "message": "Bot task runner is not configured"}), 500
+    if not bot_tasks.submit(operation, func):
         return (
             jsonify({
                 "status": "error",
-                "message": str(exc),
+                "message": "Предыдущая операция с ботом ещё выполняется",
             }),
-            503,
+            409,
         )
-    return jsonify({"status": "ok"})
+    return jsonify({"status": "accepted", "operation": operation}), 202
 
 
 # NOTE[agent]: API-метод переключает режим приостановки бота.
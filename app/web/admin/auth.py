@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hmac
 from typing import Optional, Union
 
 from flask import Response, current_app, redirect, render_template, request, session, url_for
@@ -19,16 +20,21 @@ def login() -> Union[Response, str]:
     app_password = current_app.config.get("ADMIN_PASSWORD")
     credentials_configured = bool(app_login and app_password)
     if request.method == "POST":
+        form_login = request.form.get("login", "").strip()
+        form_password = request.form.get("password", "")
+        # NOTE[agent]: Оба поля сравниваются всегда и за постоянное время, поэтому
+        # длительность ответа не выдаёт, какое из них и на каком символе не совпало.
+        login_ok = _compare_secret(form_login, app_login)
+        password_ok = _compare_secret(form_password, app_password)
         if not credentials_configured:
             error = "Учётные данные администратора не настроены."
+        elif login_ok & password_ok:
+            # NOTE[agent]: В cookie хранится только флаг авторизации — это минимальный
+            # объём данных, который подписывается и разбирается на каждом запросе.
+            session[ADMIN_SESSION_KEY] = True
+            redirect_target = _safe_next_url(request.args.get("next"))
+            return redirect(redirect_target)
         else:
-            form_login = request.form.get("login", "").strip()
-            form_password = request.form.get("password", "")
-            if form_login == app_login and form_password == app_password:
-                session[ADMIN_SESSION_KEY] = True
-                session["admin_login"] = form_login
-                redirect_target = _safe_next_url(request.args.get("next"))
-                return redirect(redirect_target)
             error = "Неверный логин или пароль."
     return render_template(
         "admin/login.html",
@@ -37,11 +43,27 @@ def login() -> Union[Response, str]:
     )
 
 
+# NOTE[agent]: Сравнение секретов без раннего выхода на первом несовпадении.
+def _compare_secret(provided: str, expected: Optional[str]) -> bool:
+    """Сравнивает введённое значение с ожидаемым за постоянное время.
+
+    Args:
+        provided: Значение из формы входа.
+        expected: Значение из конфигурации; None трактуется как пустая строка.
+
+    Returns:
+        True, если значения совпадают.
+    """
+
+    return hmac.compare_digest(provided.encode("utf-8"), (expected or "").encode("utf-8"))
+
+
 # NOTE[agent]: Маршрут завершает сессию администратора.
 @admin_bp.route("/logout")
 def logout() -> Response:
     """Выходит из админ-панели и очищает сессию пользователя."""
 
     session.pop(ADMIN_SESSION_KEY, None)
+    # NOTE[agent]: Ключ admin_login больше не пишется, но удаляется из старых cookie.
     session.pop("admin_login", None)
     return redirect(url_for("admin.login"))
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
+import re
+from datetime import datetime
 from typing import Union
 
 from flask import Response, current_app, redirect, render_template, request, url_for
 from sqlalchemy.exc import SQLAlchemyError
 
-from ...models import BotCommand, db
+from ...models import BotCommand, db, upsert_insert
 from . import admin_bp
+from .page_cache import conditional_page
+
+# NOTE[agent]: Имя команды — первое слово ввода без ведущих косых черт.
+_COMMAND_NAME_RE = re.compile(r"/*\s*(\S*)")
 
 
 # NOTE[agent]: Управление пользовательскими командами Telegram-бота.
 @admin_bp.route("/commands", methods=["GET", "POST"])
+@conditional_page(BotCommand)
 def manage_commands() -> Union[Response, str]:
     """Позволяет добавить или отредактировать команды вида '/example'."""
 
@@ -20,10 +27,7 @@ def manage_commands() -> Union[Response, str]:
         action = request.form.get("action", "create")
         command_raw = (request.form.get("command", "") or "").strip()
         response_text = (request.form.get("response", "") or "").strip()
-        normalized = command_raw.lstrip("/")
-        if " " in normalized:
-            normalized = normalized.split()[0]
-        normalized = normalized.lower()
+        normalized = _COMMAND_NAME_RE.match(command_raw).group(1).lower()
 
         if action == "delete":
             command_id_raw = request.form.get("command_id")
@@ -34,7 +38,7 @@ def manage_commands() -> Union[Response, str]:
             command = None
             if command_id is not None:
                 try:
-                    command = BotCommand.query.get(command_id)
+                    command = db.session.get(BotCommand, command_id)
                 except SQLAlchemyError as exc:
                     current_app.logger.warning("Ошибка при поиске команды: %s", exc)
                     db.session.rollback()
@@ -54,12 +58,6 @@ def manage_commands() -> Union[Response, str]:
         elif not response_text:
             current_app.logger.warning("Не задан ответ для команды %s", command_raw)
         else:
-            try:
-                existing = BotCommand.query.filter_by(name=normalized).first()
-            except SQLAlchemyError as exc:
-                existing = None
-                current_app.logger.warning("Ошибка при поиске команды %s: %s", normalized, exc)
-                db.session.rollback()
             if action == "update":
                 command_id_raw = request.form.get("command_id")
                 try:
@@ -69,7 +67,7 @@ def manage_commands() -> Union[Response, str]:
                 command = None
                 if command_id is not None:
                     try:
-                        command = BotCommand.query.get(command_id)
+                        command = db.session.get(BotCommand, command_id)
                     except SQLAlchemyError as exc:
                         current_app.logger.warning(
                             "Ошибка при загрузке команды id=%s: %s", command_id_raw, exc
@@ -80,10 +78,18 @@ def manage_commands() -> Union[Response, str]:
                         "Не удалось обновить команду: id=%s не найден", command_id_raw
                     )
                 else:
-                    conflict = None
-                    if existing and existing.id != command.id:
-                        conflict = existing
-                    if conflict:
+                    # NOTE[agent]: Для проверки конфликта имён достаточно id, строка не загружается.
+                    try:
+                        existing_id = (
+                            db.session.query(BotCommand.id).filter_by(name=normalized).scalar()
+                        )
+                    except SQLAlchemyError as exc:
+                        existing_id = None
+                        current_app.logger.warning(
+                            "Ошибка при поиске команды %s: %s", normalized, exc
+                        )
+                        db.session.rollback()
+                    if existing_id is not None and existing_id != command.id:
                         current_app.logger.warning(
                             "Конфликт имён команд: %s уже используется", normalized
                         )
@@ -98,25 +104,14 @@ def manage_commands() -> Union[Response, str]:
                             )
                         return redirect(url_for("admin.manage_commands"))
             else:
-                if existing:
-                    try:
-                        existing.update(response_text=response_text)
-                        db.session.commit()
-                    except SQLAlchemyError as exc:
-                        db.session.rollback()
-                        current_app.logger.warning(
-                            "Ошибка при обновлении ответа команды %s: %s", normalized, exc
-                        )
-                else:
-                    try:
-                        command = BotCommand(name=normalized, response_text=response_text)
-                        db.session.add(command)
-                        db.session.commit()
-                    except SQLAlchemyError as exc:
-                        db.session.rollback()
-                        current_app.logger.warning(
-                            "Ошибка при создании команды %s: %s", normalized, exc
-                        )
+                try:
+                    _upsert_command(normalized, response_text)
+                    db.session.commit()
+                except SQLAlchemyError as exc:
+                    db.session.rollback()
+                    current_app.logger.warning(
+                        "Ошибка при сохранении команды %s: %s", normalized, exc
+                    )
                 return redirect(url_for("admin.manage_commands"))
 
     try:
@@ -126,3 +121,40 @@ def manage_commands() -> Union[Response, str]:
         db.session.rollback()
         commands = []
     return render_template("admin/commands.html", commands=commands)
+
+
+# NOTE[agent]: Создаёт команду или обновляет её ответ одним запросом без предварительного SELECT.
+def _upsert_command(name: str, response_text: str) -> None:
+    """Сохраняет команду через INSERT ... ON CONFLICT (name) DO UPDATE.
+
+    Уникальный индекс по имени разрешает гонку параллельных сохранений
+    на стороне СУБД. Для прочих диалектов используется поиск и запись через ORM.
+
+    Args:
+        name: Нормализованное имя команды без косой черты.
+        response_text: Текст ответа команды.
+    """
+
+    stmt = upsert_insert(BotCommand)
+    if stmt is None:
+        existing = BotCommand.query.filter_by(name=name).first()
+        if existing:
+            existing.update(response_text=response_text)
+        else:
+            db.session.add(BotCommand(name=name, response_text=response_text))
+        return
+    now = datetime.utcnow()
+    stmt = stmt.values(
+        name=name,
+        response_text=response_text,
+        created_at=now,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BotCommand.name],
+        set_={
+            "response_text": stmt.excluded.response_text,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.session.execute(stmt)
@@ -2,54 +2,62 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime, time
 from typing import Optional
 
 from flask import current_app, render_template, request
+from sqlalchemy import case, or_
+from sqlalchemy.orm import joinedload
 
 from ...bot.bot_service import TelegramBotManager
 from ...models import LLMProvider, ModelConfig
 from ...services.settings_service import SettingsService
 from ...services.statistics_service import StatisticsService
 from . import admin_bp
+from .page_cache import cached_page
+
+
+# NOTE[agent]: Настройки, которые дашборд выводит или использует при рендеринге.
+_DASHBOARD_SETTING_KEYS = ("active_model_id", "bot_paused", "bot_pause_message")
 
 
 # NOTE[agent]: Точка входа в админку отображает ключевые метрики и статус бота.
 @admin_bp.route("/")
+@cached_page
 def dashboard() -> str:
     """Отображает сводную статистику и основные настройки."""
 
+    return _render_dashboard()
+
+
+# NOTE[agent]: Собирает данные дашборда и рендерит шаблон.
+def _render_dashboard() -> str:
+    """Формирует HTML дашборда по параметрам текущего запроса."""
+
     period = int(request.args.get("days", 7) or 7)
     start_raw = request.args.get("start")
     end_raw = request.args.get("end")
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     if start_raw and end_raw:
-        try:
-            start_date = datetime.strptime(start_raw, "%Y-%m-%d")
-            end_date = datetime.strptime(end_raw, "%Y-%m-%d")
-            if end_date < start_date:
-                start_date, end_date = end_date, start_date
-        except ValueError:
+        start_date = _parse_date(start_raw)
+        end_date = _parse_date(end_raw)
+        if start_date is None or end_date is None:
             start_date = None
             end_date = None
+        elif end_date < start_date:
+            start_date, end_date = end_date, start_date
     stats = StatisticsService().gather(days=period, start=start_date, end=end_date)
     selected_period_days = period
     if start_date and end_date:
         selected_period_days = (end_date - start_date).days + 1
-    settings = SettingsService().all_settings()
+    # NOTE[agent]: Нужные ключи читаются через кеш настроек, без выборки всей таблицы.
+    settings_service = SettingsService()
+    settings = {key: settings_service.get(key, "") for key in _DASHBOARD_SETTING_KEYS}
     bot_manager: Optional[TelegramBotManager] = current_app.extensions.get("bot_manager")  # type: ignore[assignment]
     is_bot_running = bot_manager.is_running() if bot_manager else False
-    models = ModelConfig.query.order_by(ModelConfig.created_at.desc()).all()
     provider_titles = LLMProvider.vendor_titles()
-    active_model = None
-    active_model_id = settings.get("active_model_id", "")
-    for model in models:
-        if active_model_id and str(model.id) == active_model_id:
-            active_model = model
-            break
-    if active_model is None:
-        active_model = next((model for model in models if model.is_default), None)
+    active_model = _resolve_active_model(settings.get("active_model_id", ""))
     start_value = start_date.strftime("%Y-%m-%d") if start_date else ""
     end_value = end_date.strftime("%Y-%m-%d") if end_date else ""
     return render_template(
@@ -61,9 +69,57 @@ def dashboard() -> str:
         selected_period_days=selected_period_days,
         settings=settings,
         is_bot_running=is_bot_running,
-        models=models,
         active_model=active_model,
         start_value=start_value,
         end_value=end_value,
         provider_titles=provider_titles,
     )
+
+
+# NOTE[agent]: Разбирает дату из параметров запроса без разбора строки формата strptime.
+def _parse_date(value: str) -> Optional[datetime]:
+    """Преобразует строку ГГГГ-ММ-ДД в начало соответствующего дня.
+
+    Args:
+        value: Дата из параметров запроса.
+
+    Returns:
+        Дата и время начала дня или None, если строка некорректна.
+    """
+
+    try:
+        parsed = date.fromisoformat(value)
+    except ValueError:
+        return None
+    return datetime.combine(parsed, time.min)
+
+
+# NOTE[agent]: Находит активную модель одним запросом: приоритет выбирает ORDER BY.
+def _resolve_active_model(active_model_id: str) -> Optional[ModelConfig]:
+    """Возвращает модель из настройки active_model_id или модель по умолчанию.
+
+    Args:
+        active_model_id: Значение настройки active_model_id.
+
+    Returns:
+        Конфигурация активной модели или None, если подходящей модели нет.
+    """
+
+    query = ModelConfig.query.options(joinedload(ModelConfig.provider))
+    if not active_model_id.isdigit():
+        # NOTE[agent]: Сортировка нужна базам без уникального индекса по is_default,
+        # где строк с флагом может быть несколько: берётся самая новая.
+        return (
+            query.filter(ModelConfig.is_default.is_(True))
+            .order_by(ModelConfig.created_at.desc())
+            .first()
+        )
+    target_id = int(active_model_id)
+    return (
+        query.filter(or_(ModelConfig.id == target_id, ModelConfig.is_default.is_(True)))
+        .order_by(
+            case((ModelConfig.id == target_id, 0), else_=1),
+            ModelConfig.created_at.desc(),
+        )
+        .first()
+    )
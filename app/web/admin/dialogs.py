@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from flask import Response, redirect, url_for
+from datetime import datetime
+
+from flask import Response, abort, redirect, url_for
+from sqlalchemy import select, update
 
 from ...models import Dialog, db
 from . import admin_bp
@@ -13,7 +16,19 @@ from . import admin_bp
 def close_dialog(dialog_id: int) -> Response:
     """Помечает диалог закрытым."""
 
-    dialog = Dialog.query.get_or_404(dialog_id)
-    dialog.close()
+    # NOTE[agent]: Диалог закрывается одним UPDATE без предварительной загрузки строки;
+    # уже закрытые диалоги не переписываются и сохраняют исходное время окончания.
+    result = db.session.execute(
+        update(Dialog)
+        .where(Dialog.id == dialog_id, Dialog.is_active.is_(True))
+        .values(is_active=False, ended_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.session.rollback()
+        exists = db.session.scalar(select(Dialog.id).where(Dialog.id == dialog_id))
+        if exists is None:
+            abort(404)
+        return redirect(url_for("admin.logs"))
     db.session.commit()
     return redirect(url_for("admin.logs"))
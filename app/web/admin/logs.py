@@ -5,129 +5,287 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
-from flask import render_template, request
-from sqlalchemy import func
+from flask import Response, abort, jsonify, render_template, request
+from sqlalchemy import Integer, and_, func, select
 
 from ...models import Dialog, MessageLog, User, db
 from . import admin_bp
+from .page_cache import cached_page
+from .pagination import after_cursor, decode_cursor, encode_cursor
+
+
+# NOTE[agent]: Длина превью текста в таблице логов.
+PREVIEW_LIMIT = 150
+# NOTE[agent]: Длина заголовка диалога и его всплывающей подсказки в списке диалогов.
+DIALOG_TITLE_LIMIT = 15
+DIALOG_FULL_TITLE_LIMIT = 255
+# NOTE[agent]: Размер страниц журнала по умолчанию и верхняя граница, задаваемая через URL.
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
 
 
 # NOTE[agent]: Страница с журналом сообщений для аудита.
 @admin_bp.route("/logs")
+@cached_page
 def logs() -> str:
     """Показывает последние сообщения пользователей и ответы LLM."""
 
-    limit = int(request.args.get("limit", 50) or 50)
-    dialog_limit = int(request.args.get("dialog_limit", 50) or 50)
-    message_stats = (
+    limit = _get_page_limit("limit")
+    dialog_limit = _get_page_limit("dialog_limit")
+    dialog_cursor_raw = request.args.get("dialog_cursor")
+    dialog_cursor = decode_cursor(dialog_cursor_raw)
+    # NOTE[agent]: Сначала отбираются последние диалоги, затем статистика сообщений
+    # агрегируется одним проходом только по ним, а не по всей таблице логов.
+    # Лишняя строка сверх dialog_limit сообщает о наличии следующей страницы.
+    recent_dialogs_query = db.session.query(
+        Dialog.id.label("id"),
+        Dialog.user_id.label("user_id"),
+        Dialog.is_active.label("is_active"),
+        Dialog.started_at.label("started_at"),
+    )
+    # NOTE[agent]: Keyset-пагинация диалогов по индексу (started_at, id) без OFFSET.
+    if dialog_cursor is not None:
+        recent_dialogs_query = recent_dialogs_query.filter(
+            after_cursor(Dialog.started_at, Dialog.id, dialog_cursor)
+        )
+    recent_dialogs = (
+        recent_dialogs_query.order_by(Dialog.started_at.desc(), Dialog.id.desc())
+        .limit(dialog_limit + 1)
+        .subquery()
+    )
+    # NOTE[agent]: Первое сообщение каждого диалога выбирается оконной функцией за один
+    # проход по индексу (dialog_id, message_index) вместо коррелированного подзапроса
+    # на каждую строку; берётся только префикс для заголовка и подсказки.
+    ranked_messages = (
         db.session.query(
             MessageLog.dialog_id.label("dialog_id"),
-            func.count(MessageLog.id).label("message_count"),
-            func.coalesce(func.sum(MessageLog.tokens_used), 0).label("tokens_spent"),
-            func.coalesce(func.sum(MessageLog.prompt_tokens), 0).label("prompt_tokens_spent"),
-            func.coalesce(func.sum(MessageLog.completion_tokens), 0).label("completion_tokens_spent"),
+            func.substr(MessageLog.user_message, 1, DIALOG_FULL_TITLE_LIMIT).label("first_message"),
+            func.row_number()
+            .over(
+                partition_by=MessageLog.dialog_id,
+                order_by=(MessageLog.message_index.asc(), MessageLog.id.asc()),
+            )
+            .label("position"),
         )
-        .group_by(MessageLog.dialog_id)
+        .join(recent_dialogs, MessageLog.dialog_id == recent_dialogs.c.id)
         .subquery()
     )
-    first_message_subquery = (
-        db.session.query(MessageLog.user_message)
-        .filter(MessageLog.dialog_id == Dialog.id)
-        .order_by(MessageLog.message_index.asc())
-        .limit(1)
-        .correlate(Dialog)
-        .scalar_subquery()
-    )
     dialog_rows = (
         db.session.query(
-            Dialog.id.label("dialog_id"),
-            Dialog.is_active,
+            recent_dialogs.c.id.label("dialog_id"),
+            recent_dialogs.c.is_active,
+            recent_dialogs.c.started_at,
             User.username,
             User.telegram_id,
-            func.coalesce(message_stats.c.message_count, 0).label("message_count"),
-            func.coalesce(message_stats.c.tokens_spent, 0).label("tokens_spent"),
-            func.coalesce(message_stats.c.prompt_tokens_spent, 0).label("prompt_tokens_spent"),
-            func.coalesce(message_stats.c.completion_tokens_spent, 0).label("completion_tokens_spent"),
-            first_message_subquery.label("first_message"),
+            func.count(MessageLog.id).label("message_count"),
+            func.coalesce(func.sum(MessageLog.tokens_used), 0, type_=Integer).label("tokens_spent"),
+            func.coalesce(func.sum(MessageLog.prompt_tokens), 0, type_=Integer).label(
+                "prompt_tokens_spent"
+            ),
+            func.coalesce(func.sum(MessageLog.completion_tokens), 0, type_=Integer).label(
+                "completion_tokens_spent"
+            ),
+            ranked_messages.c.first_message,
         )
-        .join(User, Dialog.user_id == User.id)
-        .outerjoin(message_stats, message_stats.c.dialog_id == Dialog.id)
-        .order_by(Dialog.started_at.desc())
-        .limit(dialog_limit)
-        .all()
-    )
-    dialog_logs: List[Dict[str, Any]] = []
-    for row in dialog_rows:
-        base_title = row.first_message or ""
-        title = base_title[:15]
-        if base_title and len(base_title) > 15:
-            title = f"{title}…"
-        if not title:
-            title = f"Диалог #{row.dialog_id}"
-        login = row.username or row.telegram_id or "—"
-        dialog_logs.append(
-            {
-                "id": row.dialog_id,
-                "title": title,
-                "full_title": base_title,
-                "message_count": int(row.message_count or 0),
-                "tokens_spent": int(row.tokens_spent or 0),
-                "input_tokens": int(row.prompt_tokens_spent or 0),
-                "output_tokens": int(row.completion_tokens_spent or 0),
-                "username": login,
-                "is_active": row.is_active,
-            }
+        .select_from(recent_dialogs)
+        .join(User, recent_dialogs.c.user_id == User.id)
+        .outerjoin(
+            ranked_messages,
+            and_(
+                ranked_messages.c.dialog_id == recent_dialogs.c.id,
+                ranked_messages.c.position == 1,
+            ),
         )
-
-    # NOTE[agent]: Функция формирует краткое представление текста для таблицы логов.
-    def _make_preview(text: Optional[str]) -> Tuple[str, bool, bool, str]:
-        """Возвращает укороченную версию текста и метаданные для отображения."""
-
-        if not text:
-            return "—", False, False, ""
-        preview_limit = 150
-        is_long = len(text) > preview_limit
-        preview = text if not is_long else f"{text[:preview_limit]}..."
-        return preview, True, is_long, text
-
-    records = (
-        MessageLog.query.order_by(MessageLog.created_at.desc())
-        .limit(limit)
+        .outerjoin(MessageLog, MessageLog.dialog_id == recent_dialogs.c.id)
+        .group_by(
+            recent_dialogs.c.id,
+            recent_dialogs.c.is_active,
+            recent_dialogs.c.started_at,
+            User.username,
+            User.telegram_id,
+            ranked_messages.c.first_message,
+        )
+        .order_by(recent_dialogs.c.started_at.desc(), recent_dialogs.c.id.desc())
         .all()
     )
+    next_dialog_cursor = None
+    if len(dialog_rows) > dialog_limit:
+        dialog_rows = dialog_rows[:dialog_limit]
+        next_dialog_cursor = encode_cursor(dialog_rows[-1].started_at, dialog_rows[-1].dialog_id)
+    dialog_logs: List[Dict[str, Any]] = [
+        {
+            "id": row.dialog_id,
+            "title": _dialog_title(row.first_message, row.dialog_id),
+            "full_title": row.first_message or "",
+            "message_count": row.message_count,
+            "tokens_spent": row.tokens_spent,
+            "input_tokens": row.prompt_tokens_spent,
+            "output_tokens": row.completion_tokens_spent,
+            "username": row.username or row.telegram_id or "—",
+            "is_active": row.is_active,
+        }
+        for row in dialog_rows
+    ]
 
-    message_rows: List[Dict[str, Any]] = []
-    for record in records:
-        user_preview, has_user_text, user_truncated, user_full = _make_preview(record.user_message)
-        llm_preview, has_llm_text, llm_truncated, llm_full = _make_preview(record.llm_response)
-        created_at_value = record.created_at
-        created_at_formatted = "—"
-        if isinstance(created_at_value, datetime):
-            created_at_formatted = created_at_value.strftime("%d.%m.%Y")
-        message_rows.append(
-            {
-                "id": record.id,
-                "dialog_id": record.dialog_id,
-                "message_index": int(record.message_index or 0),
-                "username": record.user.username or record.user.telegram_id or "—",
-                "user_message_preview": user_preview,
-                "user_message_full": user_full,
-                "user_message_present": has_user_text,
-                "user_message_truncated": user_truncated,
-                "llm_response_preview": llm_preview,
-                "llm_response_full": llm_full,
-                "llm_response_present": has_llm_text,
-                "llm_response_truncated": llm_truncated,
-                "tokens_used": int(record.tokens_used or 0),
-                "input_tokens": int(record.prompt_tokens or 0),
-                "output_tokens": int(record.completion_tokens or 0),
-                "created_at": created_at_formatted,
-            }
+    cursor_raw = request.args.get("cursor")
+    cursor = decode_cursor(cursor_raw)
+    # NOTE[agent]: Из БД читаются только префиксы текстов и их длины, полные тексты
+    # подгружаются отдельно через message_full_text при раскрытии строки.
+    messages_query = (
+        select(
+            MessageLog.id,
+            MessageLog.dialog_id,
+            MessageLog.message_index,
+            MessageLog.tokens_used,
+            MessageLog.prompt_tokens,
+            MessageLog.completion_tokens,
+            _created_date_column().label("created_at"),
+            MessageLog.created_at.label("created_at_value"),
+            func.substr(MessageLog.user_message, 1, PREVIEW_LIMIT).label("user_preview"),
+            func.length(MessageLog.user_message).label("user_length"),
+            func.substr(MessageLog.llm_response, 1, PREVIEW_LIMIT).label("llm_preview"),
+            func.length(MessageLog.llm_response).label("llm_length"),
+            User.username,
+            User.telegram_id,
         )
+        .join(User, MessageLog.user_id == User.id)
+    )
+    # NOTE[agent]: Keyset-пагинация: следующая страница читается по индексу без OFFSET.
+    if cursor is not None:
+        messages_query = messages_query.where(
+            after_cursor(MessageLog.created_at, MessageLog.id, cursor)
+        )
+    records = db.session.execute(
+        messages_query.order_by(MessageLog.created_at.desc(), MessageLog.id.desc()).limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(records[-1].created_at_value, records[-1].id)
+
+    message_rows: List[Dict[str, Any]] = [_build_message_row(record) for record in records]
     return render_template(
         "admin/logs.html",
         message_rows=message_rows,
         limit=limit,
+        cursor=cursor_raw if cursor is not None else None,
+        next_cursor=next_cursor,
         dialog_logs=dialog_logs,
         dialog_limit=dialog_limit,
+        dialog_cursor=dialog_cursor_raw if dialog_cursor is not None else None,
+        next_dialog_cursor=next_dialog_cursor,
     )
+
+
+# NOTE[agent]: Отдаёт полный текст сообщения и ответа для модального окна логов;
+# эндпоинт перечислен в _JSON_ENDPOINTS и при истёкшей сессии получает 401.
+@admin_bp.route("/logs/<int:message_id>/full")
+def message_full_text(message_id: int) -> Response:
+    """Возвращает полные тексты запроса пользователя и ответа LLM в JSON."""
+
+    row = db.session.execute(
+        select(MessageLog.user_message, MessageLog.llm_response).where(MessageLog.id == message_id)
+    ).first()
+    if row is None:
+        abort(404)
+    return jsonify({
+        "id": message_id,
+        "user_message": row.user_message or "",
+        "llm_response": row.llm_response or "",
+    })
+
+
+# NOTE[agent]: Читает размер страницы из URL в допустимых пределах.
+def _get_page_limit(name: str) -> int:
+    """Возвращает размер страницы журнала из параметра запроса.
+
+    Некорректное значение заменяется значением по умолчанию, а слишком большое
+    ограничивается MAX_PAGE_LIMIT, чтобы один запрос не выгружал всю таблицу логов.
+
+    Args:
+        name: Имя параметра запроса.
+
+    Returns:
+        Число строк на странице.
+    """
+
+    value = request.args.get(name, DEFAULT_PAGE_LIMIT, type=int) or DEFAULT_PAGE_LIMIT
+    return max(1, min(value, MAX_PAGE_LIMIT))
+
+
+# NOTE[agent]: Собирает строку таблицы сообщений из проекции запроса логов.
+def _build_message_row(record: Any) -> Dict[str, Any]:
+    """Возвращает словарь с превью текстов и метриками одного сообщения."""
+
+    user_preview, has_user_text, user_truncated = _make_preview(
+        record.user_preview, record.user_length
+    )
+    llm_preview, has_llm_text, llm_truncated = _make_preview(
+        record.llm_preview, record.llm_length
+    )
+    return {
+        "id": record.id,
+        "dialog_id": record.dialog_id,
+        "message_index": record.message_index or 0,
+        "username": record.username or record.telegram_id or "—",
+        "user_message_preview": user_preview,
+        "user_message_present": has_user_text,
+        "user_message_truncated": user_truncated,
+        "llm_response_preview": llm_preview,
+        "llm_response_present": has_llm_text,
+        "llm_response_truncated": llm_truncated,
+        "tokens_used": record.tokens_used or 0,
+        "input_tokens": record.prompt_tokens or 0,
+        "output_tokens": record.completion_tokens or 0,
+        "created_at": _format_date(record.created_at),
+    }
+
+
+# NOTE[agent]: Формирует короткий заголовок диалога по первому сообщению.
+def _dialog_title(first_message: Optional[str], dialog_id: int) -> str:
+    """Возвращает усечённый заголовок диалога или номер диалога, если текста нет."""
+
+    if not first_message:
+        return f"Диалог #{dialog_id}"
+    if len(first_message) > DIALOG_TITLE_LIMIT:
+        return f"{first_message[:DIALOG_TITLE_LIMIT]}…"
+    return first_message
+
+
+# NOTE[agent]: Функция формирует краткое представление текста для таблицы логов.
+def _make_preview(text: Optional[str], length: Optional[int]) -> Tuple[str, bool, bool]:
+    """Возвращает укороченную версию текста и признаки наличия и усечения."""
+
+    if not text:
+        return "—", False, False
+    is_long = (length or 0) > PREVIEW_LIMIT
+    preview = text if not is_long else f"{text}..."
+    return preview, True, is_long
+
+
+# NOTE[agent]: Выбирает выражение даты сообщения: форматирование выполняет сама СУБД.
+def _created_date_column() -> Any:
+    """Возвращает SQL-выражение даты создания в формате ДД.ММ.ГГГГ.
+
+    Для СУБД без известной функции форматирования возвращается исходный столбец,
+    и дата форматируется в Python.
+    """
+
+    dialect_name = db.session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return func.to_char(MessageLog.created_at, "DD.MM.YYYY")
+    if dialect_name == "sqlite":
+        return func.strftime("%d.%m.%Y", MessageLog.created_at)
+    return MessageLog.created_at
+
+
+# NOTE[agent]: Форматирует дату сообщения для таблицы логов.
+def _format_date(value: Any) -> str:
+    """Возвращает дату в формате ДД.ММ.ГГГГ или прочерк."""
+
+    if isinstance(value, str):
+        return value or "—"
+    if isinstance(value, datetime):
+        # NOTE[agent]: Фиксированный формат собирается f-строкой без разбора шаблона strftime.
+        return f"{value.day:02d}.{value.month:02d}.{value.year:04d}"
+    return "—"
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Optional, Union
+from typing import Mapping, Optional, Union
 
-from flask import Response, current_app, render_template, request
+from flask import Response, current_app, redirect, render_template, request, url_for
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
 
 from ...models import LLMProvider, ModelConfig, db
 from ...services.settings_service import SettingsService
@@ -23,30 +25,11 @@ def manage_models() -> Union[Response, str]:
         model_name = request.form.get("model", "").strip()
         instruction = request.form.get("system_instruction", "").strip() or None
 
-        # NOTE[agent]: Вспомогательная функция безопасно преобразует значение в float.
-        def _float(field: str, default: float) -> float:
-            """Возвращает значение поля как float или значение по умолчанию."""
-
-            value = request.form.get(field, "")
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return default
-
-        # NOTE[agent]: Вспомогательная функция безопасно преобразует значение в int.
-        def _int(field: str, default: int) -> int:
-            """Возвращает значение поля как int или значение по умолчанию."""
-
-            value = request.form.get(field, "")
-            try:
-                return int(value)
-            except (TypeError, ValueError):
-                return default
-
-        temperature = _float("temperature", 1.0)
-        max_tokens = _int("max_tokens", 512)
-        dialog_token_limit = _int("dialog_token_limit", 20000)
-        top_p = _float("top_p", 1.0)
+        form = request.form
+        temperature = _get_form_float(form, "temperature", 1.0)
+        max_tokens = _get_form_int(form, "max_tokens", 512)
+        dialog_token_limit = _get_form_int(form, "dialog_token_limit", 20000)
+        top_p = _get_form_float(form, "top_p", 1.0)
         is_default = request.form.get("is_default") == "on"
         provider_id_raw = request.form.get("provider_id")
         provider: Optional[LLMProvider] = None
@@ -55,13 +38,13 @@ def manage_models() -> Union[Response, str]:
         except (TypeError, ValueError):
             provider_id = None
         if provider_id is not None:
-            provider = LLMProvider.query.get(provider_id)
+            provider = db.session.get(LLMProvider, provider_id)
             if provider is None:
                 current_app.logger.warning("Поставщик с id=%s не найден", provider_id)
 
         if action == "create" and name and model_name and provider:
             if is_default:
-                ModelConfig.query.update({ModelConfig.is_default: False})
+                _clear_default_flag()
             model = ModelConfig(
                 name=name,
                 model=model_name,
@@ -74,9 +57,11 @@ def manage_models() -> Union[Response, str]:
                 is_default=is_default,
             )
             db.session.add(model)
-            db.session.commit()
             if is_default:
-                settings_service.set("active_model_id", str(model.id))
+                # NOTE[agent]: flush выдаёт id модели, настройка фиксируется той же транзакцией.
+                db.session.flush()
+                settings_service.set("active_model_id", str(model.id), commit=False)
+            db.session.commit()
         elif action == "create" and not provider:
             current_app.logger.warning("Не удалось создать модель %s: не выбран поставщик", name)
         elif action == "update":
@@ -87,7 +72,7 @@ def manage_models() -> Union[Response, str]:
             except (TypeError, ValueError):
                 model_id = None
             if model_id is not None:
-                model_obj = ModelConfig.query.get(model_id)
+                model_obj = db.session.get(ModelConfig, model_id)
             if model_obj:
                 model_obj.name = name or model_obj.name
                 model_obj.model = model_name or model_obj.model
@@ -99,19 +84,29 @@ def manage_models() -> Union[Response, str]:
                 model_obj.top_p = top_p
                 model_obj.system_instruction = instruction
                 if is_default:
-                    ModelConfig.query.update({ModelConfig.is_default: False})
+                    # NOTE[agent]: Если модель уже основная, других строк с флагом нет.
+                    if not model_obj.is_default:
+                        _clear_default_flag(exclude_id=model_obj.id)
                     model_obj.is_default = True
                 else:
                     model_obj.is_default = False
-                db.session.commit()
                 if is_default:
-                    settings_service.set("active_model_id", str(model_obj.id))
+                    settings_service.set("active_model_id", str(model_obj.id), commit=False)
                 else:
                     current_active = settings_service.get("active_model_id")
                     if current_active and current_active == str(model_obj.id):
-                        settings_service.set("active_model_id", "")
-    models = ModelConfig.query.order_by(ModelConfig.created_at.desc()).all()
+                        settings_service.set("active_model_id", "", commit=False)
+                db.session.commit()
+        # NOTE[agent]: После сохранения отдаём редирект, список моделей строит только GET.
+        return redirect(url_for("admin.manage_models"), code=303)
+    # NOTE[agent]: selectinload догружает поставщиков моделей одним запросом IN
+    # и не дублирует столбцы поставщика в каждой строке моделей.
     providers = LLMProvider.query.order_by(LLMProvider.name.asc()).all()
+    models = (
+        ModelConfig.query.options(selectinload(ModelConfig.provider))
+        .order_by(ModelConfig.created_at.desc())
+        .all()
+    )
     provider_titles = LLMProvider.vendor_titles()
     active_model_id = settings_service.get("active_model_id")
     return render_template(
@@ -121,3 +116,51 @@ def manage_models() -> Union[Response, str]:
         providers=providers,
         provider_titles=provider_titles,
     )
+
+
+# NOTE[agent]: Безопасно преобразует поле формы в float.
+def _get_form_float(form: Mapping[str, str], field: str, default: float) -> float:
+    """Возвращает значение поля как float или значение по умолчанию."""
+
+    # NOTE[agent]: Пустое поле — частый случай, он обходится без создания исключения.
+    value = form.get(field)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# NOTE[agent]: Безопасно преобразует поле формы в int.
+def _get_form_int(form: Mapping[str, str], field: str, default: int) -> int:
+    """Возвращает значение поля как int или значение по умолчанию."""
+
+    value = form.get(field)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# NOTE[agent]: Снимает флаг модели по умолчанию только со строк, где он установлен.
+def _clear_default_flag(exclude_id: Optional[int] = None) -> None:
+    """Сбрасывает is_default у текущих моделей по умолчанию одним UPDATE.
+
+    Фильтр по is_default ограничивает запрос одной-двумя строками вместо
+    блокировки всей таблицы конфигураций. Стратегия ``fetch`` получает id
+    изменённых строк через RETURNING (PostgreSQL, SQLite 3.35+), поэтому
+    уже загруженные в сессию модели не остаются с устаревшим флагом.
+
+    Args:
+        exclude_id: Идентификатор модели, которую нужно оставить нетронутой.
+    """
+
+    stmt = update(ModelConfig).where(ModelConfig.is_default.is_(True))
+    if exclude_id is not None:
+        stmt = stmt.where(ModelConfig.id != exclude_id)
+    db.session.execute(
+        stmt.values(is_default=False).execution_options(synchronize_session="fetch")
+    )
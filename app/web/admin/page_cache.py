@@ -0,0 +1,133 @@
+"""Кеширование и условные ответы для HTML страниц админ-панели."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from cachetools import TTLCache
+from flask import Response, make_response, request
+from sqlalchemy import func, select
+
+from ...models import db
+from . import admin_bp
+
+
+# NOTE[agent]: Готовый HTML страниц по паре (эндпоинт, строка запроса); TTL ограничивает
+# отставание от данных, которые пишет бот, а не админка.
+_PAGE_CACHE: TTLCache = TTLCache(maxsize=64, ttl=5)
+_PAGE_CACHE_LOCK = threading.Lock()
+
+_TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "templates"
+
+
+# NOTE[agent]: Соль версии страниц — отпечаток шаблонов: он одинаков у всех воркеров
+# одного развёртывания и меняется при обновлении разметки, чтобы не отдать 304 на старый HTML.
+def _compute_templates_token() -> str:
+    """Возвращает хеш содержимого шаблонов приложения."""
+
+    digest = hashlib.blake2b(digest_size=8)
+    for template_path in sorted(_TEMPLATE_DIR.rglob("*.html")):
+        digest.update(template_path.relative_to(_TEMPLATE_DIR).as_posix().encode())
+        digest.update(template_path.read_bytes())
+    return digest.hexdigest()
+
+
+_TEMPLATES_TOKEN = _compute_templates_token()
+
+
+# NOTE[agent]: Декоратор отдаёт повторные GET-запросы страницы из кеша без SQL и рендеринга.
+def cached_page(view: Callable[..., str]) -> Callable[..., str]:
+    """Кеширует HTML представления с учётом строки запроса.
+
+    Args:
+        view: Функция представления, возвращающая готовый HTML.
+
+    Returns:
+        Обёртка, возвращающая закешированный HTML при повторных запросах.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs) -> str:
+        cache_key = (request.endpoint, request.query_string)
+        with _PAGE_CACHE_LOCK:
+            cached_html = _PAGE_CACHE.get(cache_key)
+        if cached_html is not None:
+            return cached_html
+        html = view(*args, **kwargs)
+        with _PAGE_CACHE_LOCK:
+            _PAGE_CACHE[cache_key] = html
+        return html
+
+    return wrapper
+
+
+# NOTE[agent]: Декоратор отвечает 304 на GET, если данные таблицы не менялись с прошлого показа.
+def conditional_page(
+    model: Any, counted_by: Optional[Any] = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Добавляет к странице слабый ETag по состоянию таблицы модели.
+
+    Версия строится по MAX(updated_at) и COUNT(*) одним агрегатным запросом,
+    который дешевле полной выборки строк и рендеринга шаблона.
+
+    Args:
+        model: ORM-модель со столбцом ``updated_at``, данные которой выводит страница.
+        counted_by: Внешний ключ связанной таблицы; число её строк по каждому значению
+            ключа входит в версию, если страница выводит размеры связанных списков.
+
+    Returns:
+        Декоратор представления.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(view)
+        def wrapper(*args, **kwargs) -> Union[Response, str]:
+            if request.method != "GET":
+                return view(*args, **kwargs)
+            last_updated, row_count = db.session.execute(
+                select(func.max(model.updated_at), func.count()).select_from(model)
+            ).one()
+            related_counts: list = []
+            if counted_by is not None:
+                related_counts = db.session.execute(
+                    select(counted_by, func.count())
+                    .group_by(counted_by)
+                    .order_by(counted_by)
+                ).all()
+            version = hashlib.blake2b(
+                f"{_TEMPLATES_TOKEN}:{last_updated}:{row_count}:{related_counts}".encode(),
+                digest_size=12,
+            ).hexdigest()
+            if request.if_none_match.contains_weak(version):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            response.set_etag(version, weak=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# NOTE[agent]: Любое изменяющее действие в админке сбрасывает кеш страниц.
+@admin_bp.after_request
+def invalidate_page_cache(response: Response) -> Response:
+    """Очищает кеш страниц после изменяющих запросов админ-панели."""
+
+    if request.method != "GET":
+        clear_page_cache()
+    return response
+
+
+# NOTE[agent]: Полный сброс кеша страниц, например при пересоздании приложения в тестах.
+def clear_page_cache() -> None:
+    """Удаляет весь закешированный HTML страниц."""
+
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE.clear()
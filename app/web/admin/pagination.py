@@ -0,0 +1,63 @@
+"""Курсоры keyset-пагинации для списков админ-панели."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+# NOTE[agent]: Курсор кодирует время создания и id последней строки страницы.
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Формирует строковый курсор для перехода к следующей странице.
+
+    Args:
+        created_at: Время создания последней показанной строки.
+        row_id: Идентификатор последней показанной строки.
+
+    Returns:
+        Строка вида ``<ISO-время>_<id>``.
+    """
+
+    return f"{created_at.isoformat()}_{row_id}"
+
+
+# NOTE[agent]: Некорректный курсор трактуется как запрос первой страницы.
+def decode_cursor(raw: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Разбирает курсор из параметров запроса.
+
+    Args:
+        raw: Значение параметра ``cursor``.
+
+    Returns:
+        Пара (время создания, id) или None, если курсор не задан или некорректен.
+    """
+
+    if not raw:
+        return None
+    created_raw, _, id_raw = raw.rpartition("_")
+    try:
+        return datetime.fromisoformat(created_raw), int(id_raw)
+    except ValueError:
+        return None
+
+
+# NOTE[agent]: Условие «строго после курсора» для сортировки (created_at DESC, id DESC).
+def after_cursor(created_column: Any, id_column: Any, cursor: Tuple[datetime, int]) -> Any:
+    """Возвращает условие WHERE для строк, идущих после курсора.
+
+    Args:
+        created_column: Столбец времени создания.
+        id_column: Столбец первичного ключа, разрешающий совпадения времени.
+        cursor: Разобранный курсор последней строки предыдущей страницы.
+
+    Returns:
+        SQL-выражение для фильтрации следующей страницы.
+    """
+
+    created_at, row_id = cursor
+    return or_(
+        created_column < created_at,
+        and_(created_column == created_at, id_column < row_id),
+    )
@@ -4,19 +4,20 @@ from __future__ import annotations
 
 from typing import Union
 
-from flask import Response, current_app, render_template, request
+from flask import Response, current_app, redirect, render_template, request, url_for
 
-from ...models import LLMProvider, db
+from ...models import LLMProvider, ModelConfig, db
 from . import admin_bp
+from .page_cache import conditional_page
 
 
 # NOTE[agent]: Управление поставщиками LLM и их API-ключами.
 @admin_bp.route("/providers", methods=["GET", "POST"])
+@conditional_page(LLMProvider, counted_by=ModelConfig.provider_id)
 def manage_providers() -> Union[Response, str]:
     """Позволяет добавлять и редактировать поставщиков API."""
 
-    vendor_choices = list(LLMProvider.allowed_vendors())
-    allowed_vendors = set(vendor_choices)
+    allowed_vendors = LLMProvider.allowed_vendors()
     vendor_titles = LLMProvider.vendor_titles()
 
     if request.method == "POST":
@@ -39,7 +40,7 @@ def manage_providers() -> Union[Response, str]:
                 provider_id = int(provider_id_raw) if provider_id_raw else None
             except (TypeError, ValueError):
                 provider_id = None
-            provider = LLMProvider.query.get(provider_id) if provider_id is not None else None
+            provider = db.session.get(LLMProvider, provider_id) if provider_id is not None else None
             if not provider:
                 current_app.logger.warning("Не удалось обновить провайдера: id=%s не найден", provider_id_raw)
             else:
@@ -50,11 +51,13 @@ def manage_providers() -> Union[Response, str]:
                 new_name = name or provider.name
                 provider.update_credentials(name=new_name, api_key=api_key)
                 db.session.commit()
+        # NOTE[agent]: После изменения отдаём редирект, список строит только GET-запрос.
+        return redirect(url_for("admin.manage_providers"))
 
     providers = LLMProvider.query.order_by(LLMProvider.created_at.desc()).all()
     return render_template(
         "admin/providers.html",
         providers=providers,
         vendor_titles=vendor_titles,
-        vendor_choices=vendor_choices,
+        vendor_choices=allowed_vendors,
     )
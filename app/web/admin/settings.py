@@ -6,7 +6,9 @@ from typing import Union
 
 from flask import Response, redirect, render_template, request, url_for
 
-from ...models import ModelConfig
+from sqlalchemy import select
+
+from ...models import ModelConfig, db
 from ...services.settings_service import SettingsService
 from . import admin_bp
 
@@ -28,12 +30,19 @@ def manage_settings() -> Union[Response, str]:
         "bot_pause_message",
     ]
     if request.method == "POST":
-        for key in keys:
-            settings_service.set(key, request.form.get(key, ""))
+        # NOTE[agent]: Все значения формы записываются одним UPSERT и одной фиксацией.
+        values = {key: request.form.get(key, "") for key in keys}
         active_model = request.form.get("active_model_id")
         if active_model:
-            settings_service.set("active_model_id", active_model)
+            values["active_model_id"] = active_model
+        settings_service.set_many(values)
         return redirect(url_for("admin.manage_settings"))
     settings = settings_service.all_settings()
-    models = ModelConfig.query.order_by(ModelConfig.name.asc()).all()
+    # NOTE[agent]: Для списка выбора нужны только id и названия; инструкции и
+    # параметры генерации не читаются, поставщик к строкам не подгружается.
+    models = db.session.execute(
+        select(ModelConfig.id, ModelConfig.name, ModelConfig.model).order_by(
+            ModelConfig.name.asc()
+        )
+    ).all()
     return render_template("admin/settings.html", settings=settings, models=models)
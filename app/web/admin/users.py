@@ -4,19 +4,51 @@ from __future__ import annotations
 
 from typing import Union
 
-from flask import Response, redirect, render_template, url_for
+from flask import Response, abort, redirect, render_template, request, url_for
+from sqlalchemy import not_, select, update
 
 from ...models import User, db
 from . import admin_bp
+from .pagination import after_cursor, decode_cursor, encode_cursor
+
+
+# NOTE[agent]: Количество пользователей на одной странице списка.
+USERS_PAGE_SIZE = 50
 
 
 # NOTE[agent]: Страница управления пользователями позволяет изменять активность.
 @admin_bp.route("/users", methods=["GET"])
 def manage_users() -> Union[Response, str]:
-    """Отображает список пользователей."""
+    """Отображает постраничный список пользователей."""
 
-    users = User.query.order_by(User.created_at.desc()).all()
-    return render_template("admin/users.html", users=users)
+    cursor_raw = request.args.get("cursor")
+    cursor = decode_cursor(cursor_raw)
+    # NOTE[agent]: Keyset-пагинация по (created_at, id) читает страницу по индексу
+    # без OFFSET; лишняя строка сообщает о наличии следующей страницы без COUNT(*).
+    query = select(
+        User.id,
+        User.telegram_id,
+        User.username,
+        User.full_name,
+        User.is_active,
+        User.created_at,
+    )
+    if cursor is not None:
+        query = query.where(after_cursor(User.created_at, User.id, cursor))
+    rows = db.session.execute(
+        query.order_by(User.created_at.desc(), User.id.desc()).limit(USERS_PAGE_SIZE + 1)
+    ).all()
+    users = rows[:USERS_PAGE_SIZE]
+    next_cursor = None
+    if len(rows) > USERS_PAGE_SIZE:
+        last = users[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return render_template(
+        "admin/users.html",
+        users=users,
+        cursor=cursor_raw if cursor is not None else None,
+        next_cursor=next_cursor,
+    )
 
 
 # NOTE[agent]: Маршрут переключает флаг активности пользователя.
@@ -24,7 +56,16 @@ def manage_users() -> Union[Response, str]:
 def toggle_user(user_id: int) -> Response:
     """Переключает доступ пользователя к боту."""
 
-    user = User.query.get_or_404(user_id)
-    user.is_active = not user.is_active
+    # NOTE[agent]: Флаг инвертируется на стороне БД одним UPDATE без загрузки пользователя.
+    result = db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(is_active=not_(User.is_active))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        db.session.rollback()
+        abort(404)
     db.session.commit()
-    return redirect(url_for("admin.manage_users"))
+    cursor = request.args.get("cursor") or None
+    return redirect(url_for("admin.manage_users", cursor=cursor))
@@ -0,0 +1,58 @@
+"""JSON-провайдер Flask на базе orjson."""
+
+from __future__ import annotations
+
+import decimal
+from typing import Any
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+
+# NOTE[agent]: Преобразует типы, которые orjson не сериализует самостоятельно.
+def _default(value: Any) -> Any:
+    """Возвращает сериализуемое представление объекта для orjson.
+
+    Args:
+        value: Объект, который orjson не умеет сериализовать напрямую.
+
+    Returns:
+        Строковое представление объекта.
+
+    Raises:
+        TypeError: Если тип объекта не поддерживается.
+    """
+
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# NOTE[agent]: Провайдер заменяет stdlib json в jsonify/get_json на C-реализацию orjson.
+class OrjsonProvider(JSONProvider):
+    """Сериализует и разбирает JSON через orjson."""
+
+    # NOTE[agent]: Опции сериализации: допускаем нестроковые ключи словарей.
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Сериализует объект в строку JSON."""
+
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Разбирает строку или байты JSON."""
+
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Формирует JSON-ответ без промежуточного декодирования в str."""
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype="application/json",
+        )
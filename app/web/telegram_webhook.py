@@ -9,36 +9,77 @@ from flask import Blueprint, Response, current_app, jsonify, request
 from ..bot.bot_service import TelegramBotManager
 
 
-# NOTE[agent]: Отдельный blueprint без префикса для публичного webhook.
-telegram_webhook_bp = Blueprint("telegram_webhook", __name__)
+# NOTE[agent]: Верхняя граница тела webhook; обновления Telegram значительно меньше.
+MAX_WEBHOOK_BYTES = 1024 * 1024
 
 
 # NOTE[agent]: Обработчик входящих webhook-запросов от Telegram.
 def telegram_webhook() -> Response:
     """Принимает webhook и передаёт обновление менеджеру бота."""
 
+    # NOTE[agent]: Слишком большое тело отклоняется по заголовку, до чтения в память.
+    if request.content_length is not None and request.content_length > MAX_WEBHOOK_BYTES:
+        return jsonify({"status": "error", "message": "Payload too large"}), 413
+    body = _read_limited_body()
+    if body is None:
+        return jsonify({"status": "error", "message": "Payload too large"}), 413
     bot_manager: Optional[TelegramBotManager] = current_app.extensions.get("bot_manager")  # type: ignore[assignment]
     if not bot_manager:
         return jsonify({"status": "error", "message": "Bot manager is not configured"}), 500
-    payload = request.get_json(force=True)
-    bot_manager.process_webhook_update(payload)
+    # NOTE[agent]: Как и прежний get_json(force=True), тело разбирается независимо
+    # от Content-Type; сырые байты не кешируются в объекте запроса.
+    try:
+        payload = current_app.json.loads(body)
+    except ValueError:
+        return jsonify({"status": "error", "message": "Invalid JSON"}), 400
+    # NOTE[agent]: Обновление обрабатывается в фоне, Telegram получает ответ сразу.
+    bot_manager.submit_webhook_update(payload)
     return jsonify({"status": "received"})
 
 
-def register_telegram_webhook_route(path: str) -> str:
-    """Привязывает обработчик webhook к переданному пути."""
+# NOTE[agent]: Тело читается из потока с ограничением, поэтому chunked-запрос без
+# Content-Length тоже не может занять больше MAX_WEBHOOK_BYTES памяти.
+def _read_limited_body() -> Optional[bytes]:
+    """Читает тело запроса не длиннее MAX_WEBHOOK_BYTES.
+
+    Returns:
+        Байты тела запроса либо None, если тело превышает допустимый размер.
+    """
+
+    chunks = []
+    received = 0
+    while True:
+        chunk = request.stream.read(MAX_WEBHOOK_BYTES + 1 - received)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+        if received > MAX_WEBHOOK_BYTES:
+            return None
+    return b"".join(chunks)
+
+
+# NOTE[agent]: Для каждого приложения создаётся свой blueprint: зарегистрированный
+# blueprint Flask запрещает менять, а путь webhook задаётся настройками.
+def create_telegram_webhook_blueprint(path: str) -> Blueprint:
+    """Создаёт blueprint без префикса с обработчиком webhook по указанному пути.
+
+    Args:
+        path: Путь webhook из настроек; пустое значение заменяется на /bot/webhook.
+
+    Returns:
+        Blueprint, готовый к регистрации в приложении.
+    """
 
     normalized_path = "/" + path.lstrip("/") if path else "/bot/webhook"
-    # NOTE[agent]: Очищаем ранее записанные обработчики, чтобы обновить путь без дублирования правил.
-    telegram_webhook_bp.deferred_functions.clear()  # type: ignore[attr-defined]
-    telegram_webhook_bp.view_functions.pop("telegram_webhook", None)
-    telegram_webhook_bp.add_url_rule(
+    blueprint = Blueprint("telegram_webhook", __name__)
+    blueprint.add_url_rule(
         normalized_path,
         endpoint="telegram_webhook",
         view_func=telegram_webhook,
         methods=["POST"],
     )
-    return normalized_path
+    return blueprint
 
 
-__all__ = ["telegram_webhook_bp", "register_telegram_webhook_route", "telegram_webhook"]
+__all__ = ["MAX_WEBHOOK_BYTES", "create_telegram_webhook_blueprint", "telegram_webhook"]
@@ -0,0 +1,11 @@
+"""Общая настройка pytest для тестов проекта."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+# NOTE[agent]: Корень проекта добавляется в путь импорта один раз за сессию тестов.
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
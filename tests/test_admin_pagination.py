@@ -0,0 +1,141 @@
+"""Тесты keyset-пагинации списков админ-панели."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from flask import Flask, template_rendered
+
+from app.models import Dialog, User, db
+from app.web.admin import ADMIN_SESSION_KEY, register_admin_blueprint
+from app.web.admin import users as users_module
+from app.web.admin.page_cache import clear_page_cache
+
+# NOTE[agent]: Каталог шаблонов приложения для тестовой админки.
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "app" / "web" / "templates"
+
+# NOTE[agent]: Все строки создаются с одной меткой времени, порядок задаёт только id.
+SHARED_TIMESTAMP = datetime(2024, 1, 1, 12, 0, 0)
+ROW_COUNT = 5
+PAGE_SIZE = 2
+
+
+# NOTE[agent]: Приложение с админкой и строками, у которых совпадает время создания.
+@pytest.fixture()
+def paged_app(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Flask]:
+    """Создаёт приложение с пользователями и диалогами с одинаковым временем."""
+
+    monkeypatch.setattr(users_module, "USERS_PAGE_SIZE", PAGE_SIZE)
+    app = Flask(
+        __name__,
+        instance_path=str(tmp_path),
+        template_folder=str(TEMPLATE_DIR),
+    )
+    app.config.update(
+        SECRET_KEY="test",
+        SQLALCHEMY_DATABASE_URI="sqlite:///" + str(tmp_path / "test.sqlite"),
+        TESTING=True,
+    )
+    db.init_app(app)
+    register_admin_blueprint(app)
+    with app.app_context():
+        db.create_all()
+        for index in range(ROW_COUNT):
+            user = User(
+                telegram_id=str(2000 + index),
+                username=f"user{index}",
+                created_at=SHARED_TIMESTAMP,
+            )
+            db.session.add_all([user, Dialog(user=user, started_at=SHARED_TIMESTAMP)])
+        db.session.commit()
+        clear_page_cache()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        clear_page_cache()
+
+
+# NOTE[agent]: Возвращает контекст шаблона, отрисованного на запрос страницы.
+def _render_context(app: Flask, url: str) -> Dict[str, Any]:
+    """Выполняет запрос авторизованным клиентом и возвращает контекст шаблона."""
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session[ADMIN_SESSION_KEY] = True
+    rendered: List[Dict[str, Any]] = []
+
+    def _capture(sender, template, context, **extra) -> None:
+        rendered.append(context)
+
+    template_rendered.connect(_capture, app)
+    try:
+        response = client.get(url)
+    finally:
+        template_rendered.disconnect(_capture, app)
+    assert response.status_code == 200
+    return rendered[0]
+
+
+# NOTE[agent]: Проходит все страницы списка и собирает id строк и курсоры.
+def _collect_pages(app: Flask, url: str, cursor_name: str, rows_name: str) -> List[List[int]]:
+    """Возвращает id строк каждой страницы, следуя курсорам до последней."""
+
+    pages: List[List[int]] = []
+    cursor = None
+    while True:
+        page_url = url if cursor is None else f"{url}&{cursor_name}={cursor}"
+        context = _render_context(app, page_url)
+        pages.append([row["id"] if isinstance(row, dict) else row.id for row in context[rows_name]])
+        cursor = context[f"next_{cursor_name}"]
+        if cursor is None:
+            return pages
+
+
+# NOTE[agent]: Проверяет, что совпадающее время разрешается по id и страницы не теряют строки.
+def test_users_pages_split_equal_timestamps_by_id(paged_app: Flask) -> None:
+    """Убеждается, что список пользователей проходится целиком без повторов."""
+
+    pages = _collect_pages(paged_app, "/admin/users?", "cursor", "users")
+
+    assert pages == [[5, 4], [3, 2], [1]]
+
+
+# NOTE[agent]: Проверяет, что некорректный курсор открывает первую страницу.
+def test_users_invalid_cursor_falls_back_to_first_page(paged_app: Flask) -> None:
+    """Убеждается, что испорченный курсор не ломает список пользователей."""
+
+    context = _render_context(paged_app, "/admin/users?cursor=not-a-cursor_x")
+
+    assert [user.id for user in context["users"]] == [5, 4]
+    assert context["cursor"] is None
+    assert context["next_cursor"] is not None
+
+
+# NOTE[agent]: Проверяет пагинацию диалогов журнала при одинаковом started_at.
+def test_logs_dialog_pages_split_equal_timestamps_by_id(paged_app: Flask) -> None:
+    """Убеждается, что список диалогов проходится целиком без повторов."""
+
+    pages = _collect_pages(
+        paged_app,
+        f"/admin/logs?dialog_limit={PAGE_SIZE}",
+        "dialog_cursor",
+        "dialog_logs",
+    )
+
+    assert pages == [[5, 4], [3, 2], [1]]
+
+
+# NOTE[agent]: Проверяет, что некорректный курсор диалогов открывает первую страницу.
+def test_logs_invalid_dialog_cursor_falls_back_to_first_page(paged_app: Flask) -> None:
+    """Убеждается, что испорченный курсор не ломает список диалогов."""
+
+    context = _render_context(
+        paged_app, f"/admin/logs?dialog_limit={PAGE_SIZE}&dialog_cursor=garbage"
+    )
+
+    assert [dialog["id"] for dialog in context["dialog_logs"]] == [5, 4]
+    assert context["dialog_cursor"] is None
+    assert context["next_dialog_cursor"] is not None
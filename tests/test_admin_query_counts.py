@@ -0,0 +1,154 @@
+"""Тесты числа SQL-запросов, выполняемых страницами админ-панели."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from flask import Flask, template_rendered
+from sqlalchemy import event
+
+from app.models import Dialog, LLMProvider, MessageLog, ModelConfig, User, db
+from app.services.settings_service import SettingsService
+from app.services.statistics_service import StatisticsService
+from app.web.admin import ADMIN_SESSION_KEY, register_admin_blueprint
+from app.web.admin.page_cache import clear_page_cache
+
+# NOTE[agent]: Каталог шаблонов приложения для тестовой админки.
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "app" / "web" / "templates"
+
+# NOTE[agent]: Количество записей, при котором N+1 заметно превышает лимиты запросов.
+SEED_SIZE = 12
+
+
+# NOTE[agent]: Считает SQL-выражения, отправленные в курсор за время блока.
+@contextmanager
+def count_queries(engine) -> Iterator[List[str]]:
+    """Собирает тексты выполненных SQL-запросов."""
+
+    statements: List[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+# NOTE[agent]: Приложение с админкой и временной SQLite-базой с тестовыми данными.
+@pytest.fixture()
+def admin_app(tmp_path: Path) -> Iterator[Flask]:
+    """Создаёт приложение с зарегистрированной админкой и тестовыми данными."""
+
+    app = Flask(
+        __name__,
+        instance_path=str(tmp_path),
+        template_folder=str(TEMPLATE_DIR),
+    )
+    app.config.update(
+        SECRET_KEY="test",
+        SQLALCHEMY_DATABASE_URI="sqlite:///" + str(tmp_path / "test.sqlite"),
+        TESTING=True,
+    )
+    db.init_app(app)
+    register_admin_blueprint(app)
+    with app.app_context():
+        db.create_all()
+        provider = LLMProvider(name="OpenAI", vendor=LLMProvider.VENDOR_OPENAI, api_key="")
+        db.session.add(provider)
+        for index in range(SEED_SIZE):
+            db.session.add(ModelConfig(name=f"model-{index}", model="gpt", provider=provider))
+            user = User(telegram_id=str(1000 + index), username=f"user{index}")
+            dialog = Dialog(user=user, title=f"Диалог {index}")
+            db.session.add_all([user, dialog])
+            for message_index in (1, 2):
+                db.session.add(
+                    MessageLog(
+                        dialog=dialog,
+                        user=user,
+                        message_index=message_index,
+                        user_message=f"Сообщение {message_index}",
+                        llm_response="Ответ",
+                        tokens_used=10,
+                    )
+                )
+        db.session.commit()
+        # NOTE[agent]: Кеши страниц, настроек и статистики общие для процесса,
+        # поэтому данные базы прошлого теста не попадают в следующий.
+        _clear_process_caches()
+        yield app
+        db.session.remove()
+        db.drop_all()
+        _clear_process_caches()
+
+
+# NOTE[agent]: Сбрасывает процессные TTL-кеши, которые переживают пересоздание приложения.
+def _clear_process_caches() -> None:
+    """Очищает кеши страниц админки, настроек и статистики."""
+
+    clear_page_cache()
+    SettingsService._invalidate_cache()  # pylint: disable=protected-access
+    StatisticsService.invalidate_cache()
+
+
+# NOTE[agent]: Лимиты равны фактическому числу запросов страницы, поэтому любой
+# N+1 на SEED_SIZE строках превышает их.
+@pytest.mark.parametrize(
+    ("url", "max_queries"),
+    [
+        # Агрегаты диалогов и страница сообщений.
+        ("/admin/logs", 2),
+        # Страница пользователей.
+        ("/admin/users", 1),
+        # Поставщики, модели, поставщики моделей через selectinload и снимок настроек.
+        ("/admin/models", 4),
+        # Метрики периода, снимок настроек и активная модель.
+        ("/admin/?days=7", 3),
+    ],
+)
+def test_admin_page_query_count_is_bounded(admin_app: Flask, url: str, max_queries: int) -> None:
+    """Убеждается, что страница админки выполняет ограниченное число SQL-запросов."""
+
+    client = admin_app.test_client()
+    with client.session_transaction() as session:
+        session[ADMIN_SESSION_KEY] = True
+
+    with admin_app.app_context():
+        engine = db.engine
+    with count_queries(engine) as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert len(statements) <= max_queries, statements
+
+
+# NOTE[agent]: Проверяет агрегаты диалогов, которые logs() считает одним запросом.
+def test_logs_dialog_summaries_are_aggregated_in_sql(admin_app: Flask) -> None:
+    """Убеждается, что счётчики и заголовок диалога совпадают с данными сообщений."""
+
+    client = admin_app.test_client()
+    with client.session_transaction() as session:
+        session[ADMIN_SESSION_KEY] = True
+    rendered: List[dict] = []
+
+    def _capture(sender, template, context, **extra) -> None:
+        rendered.append(context)
+
+    template_rendered.connect(_capture, admin_app)
+    try:
+        response = client.get("/admin/logs")
+    finally:
+        template_rendered.disconnect(_capture, admin_app)
+
+    assert response.status_code == 200
+    dialog_logs = rendered[0]["dialog_logs"]
+    assert len(dialog_logs) == SEED_SIZE
+    for dialog in dialog_logs:
+        assert dialog["message_count"] == 2
+        assert dialog["tokens_spent"] == 20
+        assert dialog["full_title"] == "Сообщение 1"
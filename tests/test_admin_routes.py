@@ -0,0 +1,33 @@
+"""Тесты регистрации маршрутов административного интерфейса."""
+
+from __future__ import annotations
+
+from flask import Flask
+
+from app.web.admin import register_admin_blueprint
+
+
+# NOTE[agent]: Проверяет, что повторное подключение админки не дублирует правила.
+def test_admin_routes_registered_once_per_app() -> None:
+    """Убеждается, что каждый эндпоинт админки зарегистрирован ровно один раз."""
+
+    for _ in range(2):
+        app = Flask(__name__)
+        register_admin_blueprint(app)
+
+        assert len(app.url_map._rules_by_endpoint["admin.dashboard"]) == 1  # type: ignore[attr-defined]
+        assert len(app.url_map._rules_by_endpoint["admin.logs"]) == 1  # type: ignore[attr-defined]
+
+
+# NOTE[agent]: Проверяет ответ JSON-эндпоинта полного текста без авторизации.
+def test_message_full_text_requires_authentication() -> None:
+    """Убеждается, что истёкшая сессия получает 401 в JSON, а не редирект на вход."""
+
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "test"
+    register_admin_blueprint(app)
+
+    response = app.test_client().get("/admin/logs/1/full")
+
+    assert response.status_code == 401
+    assert response.get_json()["message"] == "Unauthorized"
@@ -5,16 +5,15 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from pathlib import Path
 from types import SimpleNamespace
-import sys
 
 import pytest
 
-# NOTE[agent]: Добавляет корень проекта в путь импорта для unit-тестов.
-sys.path.append(str(Path(__file__).resolve().parents[1]))
+from app.bot import bot_service
+from app.bot.bot_service import BotLifecycleMixin, PollingStopTimeoutError, TelegramBotManager
 
-from app.bot.bot_service import BotLifecycleMixin, PollingStopTimeoutError
+# NOTE[agent]: Общий логгер тестовых менеджеров бота.
+_LOGGER = logging.getLogger("tests.bot_service")
 
 
 class _DummyBot:
@@ -30,18 +29,45 @@ class _DummyBot:
         self.stopped = True
 
 
-class _LifecycleStub(BotLifecycleMixin):
+# NOTE[agent]: Поток-заглушка, который не завершается, пока тест его не отпустит.
+class _StuckThread:
+    """Имитирует зависший поток polling без реального ожидания."""
+
+    name = "test-polling"
+
+    def __init__(self) -> None:
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        """Сообщает, считается ли поток живым."""
+
+        return self.alive
+
+    def join(self, timeout: float | None = None) -> None:
+        """Возвращается сразу, не дожидаясь завершения."""
+
+
+# NOTE[agent]: Общие переопределения тестовых менеджеров бота.
+class _TestLifecycleBase(BotLifecycleMixin):
+    """Подменяет логгер и создание TeleBot для изолированных проверок."""
+
+    # NOTE[agent]: Возвращает тестовый логгер.
+    def _get_logger(self):  # type: ignore[override]
+        return self._app.logger
+
+    # NOTE[agent]: Создаёт заглушку бота вместо TeleBot.
+    def _create_bot(self, token: str):  # type: ignore[override]
+        return _DummyBot()
+
+
+class _LifecycleStub(_TestLifecycleBase):
     """Минимальный менеджер для тестирования остановки polling."""
 
     def __init__(self) -> None:
         self._stop_event = threading.Event()
         self._polling_thread: threading.Thread | None = None
         self._bot = _DummyBot()
-        self._app = SimpleNamespace(logger=logging.getLogger("tests.bot_service"))
-
-    # NOTE[agent]: Возвращает тестовый логгер для изолированных проверок.
-    def _get_logger(self):  # type: ignore[override]
-        return self._app.logger
+        self._app = SimpleNamespace(logger=_LOGGER)
 
 
 # NOTE[agent]: Проверяет корректность реакции stop() на зависший поток.
@@ -49,23 +75,18 @@ def test_stop_raises_if_thread_does_not_finish() -> None:
     """Проверяет, что stop() выбрасывает исключение при зависшем потоке."""
 
     manager = _LifecycleStub()
+    thread = _StuckThread()
+    manager._polling_thread = thread  # type: ignore[assignment]
 
-    def slow_worker() -> None:
-        manager._stop_event.wait()
-        time.sleep(0.1)
-
-    thread = threading.Thread(target=slow_worker, name="test-polling", daemon=True)
-    manager._polling_thread = thread
-    thread.start()
-
+    # NOTE[agent]: Нулевой max_wait проверяет ветку тайм-аута без реального ожидания.
     with pytest.raises(PollingStopTimeoutError):
-        manager.stop(timeout=0.01, max_wait=0.02)
+        manager.stop(timeout=0.01, max_wait=0.0)
 
     assert manager._polling_thread is thread
     assert manager._bot is not None
     assert manager._stop_event.is_set()
 
-    thread.join(timeout=1)
+    thread.alive = False
     manager.stop(max_wait=1.0)
 
     assert manager._polling_thread is None
@@ -113,24 +134,16 @@ def test_stop_waits_without_deadline() -> None:
     assert not manager._stop_event.is_set()
 
 
-class _FailingStopManager(BotLifecycleMixin):
+class _FailingStopManager(_TestLifecycleBase):
     """Менеджер, у которого остановка polling всегда завершается тайм-аутом."""
 
     def __init__(self) -> None:
         self._stop_event = threading.Event()
         self._stop_event.set()
-        self._polling_thread = SimpleNamespace(is_alive=lambda: True)
+        self._polling_thread = _StuckThread()
         self._settings = SimpleNamespace(get=lambda key: "token" if key == "telegram_bot_token" else None)
         self._bot = None
-        self._app = SimpleNamespace(logger=logging.getLogger("tests.bot_service"))
-
-    # NOTE[agent]: Возвращает тестовый логгер для изолированных проверок.
-    def _get_logger(self):  # type: ignore[override]
-        return self._app.logger
-
-    # NOTE[agent]: Создаёт фиктивного бота вместо TeleBot.
-    def _create_bot(self, token: str):  # type: ignore[override]
-        return _DummyBot()
+        self._app = SimpleNamespace(logger=_LOGGER)
 
     # NOTE[agent]: Имитация неуспешной остановки polling.
     def stop(self, timeout: float = 5.0) -> None:  # type: ignore[override]
@@ -138,7 +151,7 @@ class _FailingStopManager(BotLifecycleMixin):
 
 
 # NOTE[agent]: Менеджер для проверки повторного запуска после завершения старого потока.
-class _RestartableManager(BotLifecycleMixin):
+class _RestartableManager(_TestLifecycleBase):
     """Менеджер, который умеет запускать polling после очистки завершённого потока."""
 
     def __init__(self) -> None:
@@ -150,17 +163,9 @@ class _RestartableManager(BotLifecycleMixin):
             else default
         )
         self._bot = None
-        self._app = SimpleNamespace(logger=logging.getLogger("tests.bot_service"))
+        self._app = SimpleNamespace(logger=_LOGGER)
         self.started = threading.Event()
 
-    # NOTE[agent]: Возвращает тестовый логгер.
-    def _get_logger(self):  # type: ignore[override]
-        return self._app.logger
-
-    # NOTE[agent]: Создаёт заглушку бота вместо TeleBot.
-    def _create_bot(self, token: str):  # type: ignore[override]
-        return _DummyBot()
-
     # NOTE[agent]: Упрощённый цикл polling для тестов.
     def _polling_loop(self) -> None:  # type: ignore[override]
         assert self._bot is not None
@@ -200,5 +205,63 @@ def test_start_polling_cleans_up_completed_thread() -> None:
     assert manager._polling_thread is not old_thread
     assert not manager._stop_event.is_set()
 
-    manager.started.wait(timeout=1)
+    # NOTE[agent]: wait() сразу возвращает True, если цикл уже отработал; ожидание до
+    # таймаута возможно только при сбое, и тогда тест явно падает.
+    assert manager.started.wait(timeout=1)
     manager.stop()
+
+
+# NOTE[agent]: Менеджер с маленькой очередью webhook и обработчиком под контролем теста.
+def _make_webhook_manager(monkeypatch: pytest.MonkeyPatch) -> TelegramBotManager:
+    """Создаёт менеджер, чей поток webhook ждёт разрешения перед каждым обновлением."""
+
+    monkeypatch.setattr(bot_service, "WEBHOOK_QUEUE_MAXSIZE", 2)
+    manager = TelegramBotManager()
+    manager._app = SimpleNamespace(logger=_LOGGER)  # type: ignore[assignment]
+    manager.processed = []  # type: ignore[attr-defined]
+    manager.taken = threading.Event()  # type: ignore[attr-defined]
+    manager.release = threading.Event()  # type: ignore[attr-defined]
+
+    def _process(data: dict) -> None:
+        manager.taken.set()  # type: ignore[attr-defined]
+        manager.release.wait(timeout=5)  # type: ignore[attr-defined]
+        manager.processed.append(data["update_id"])  # type: ignore[attr-defined]
+
+    manager._process_webhook_update_safely = _process  # type: ignore[method-assign]
+    return manager
+
+
+# NOTE[agent]: Проверяет политику переполнения очереди webhook.
+def test_webhook_queue_overflow_drops_oldest_update(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Убеждается, что при переполнении отбрасывается самое старое ожидающее обновление."""
+
+    manager = _make_webhook_manager(monkeypatch)
+
+    manager.submit_webhook_update({"update_id": 1})
+    # NOTE[agent]: Первое обновление занимает поток, остальные остаются в очереди.
+    assert manager.taken.wait(timeout=5)
+    for update_id in (2, 3, 4):
+        manager.submit_webhook_update({"update_id": update_id})
+    manager.release.set()
+    manager._webhook_queue.join()
+
+    assert manager.processed == [1, 3, 4]
+
+
+# NOTE[agent]: Проверяет перезапуск завершившегося потока обработки webhook.
+def test_webhook_worker_restarts_when_dead(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Убеждается, что новое обновление поднимает поток взамен завершившегося."""
+
+    manager = _make_webhook_manager(monkeypatch)
+    manager.release.set()
+    dead_worker = threading.Thread(target=lambda: None, name="dead-webhook")
+    dead_worker.start()
+    dead_worker.join()
+    manager._webhook_worker = dead_worker
+
+    manager.submit_webhook_update({"update_id": 7})
+    manager._webhook_queue.join()
+
+    assert manager._webhook_worker is not dead_worker
+    assert manager._webhook_worker.is_alive()
+    assert manager.processed == [7]
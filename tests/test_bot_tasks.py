@@ -0,0 +1,137 @@
+"""Тесты фонового выполнения операций бота и API админки для них."""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from flask.testing import FlaskClient
+
+from app.bot.bot_tasks import BotTaskRunner
+from app.web.admin import ADMIN_SESSION_KEY, register_admin_blueprint
+
+
+# NOTE[agent]: Заглушка менеджера бота: операции управляются событиями теста.
+class _FakeBotManager:
+    """Имитирует TelegramBotManager без обращения к Telegram."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+        self.polling_calls = 0
+
+    # NOTE[agent]: Ждёт разрешения теста, имитируя долгий запуск.
+    def start_polling(self) -> bool:
+        """Имитирует запуск polling."""
+
+        self.started.set()
+        self.release.wait(timeout=5)
+        self.polling_calls += 1
+        return True
+
+    # NOTE[agent]: Всегда завершается ошибкой.
+    def stop(self) -> None:
+        """Имитирует неудачную остановку бота."""
+
+        raise RuntimeError("stop failed")
+
+    def is_running(self) -> bool:
+        """Сообщает, что бот не запущен."""
+
+        return False
+
+
+# NOTE[agent]: Приложение с админкой, заглушкой бота и реальным BotTaskRunner.
+@pytest.fixture()
+def bot_app() -> Iterator[Flask]:
+    """Создаёт приложение с зарегистрированными API управления ботом."""
+
+    app = Flask(__name__)
+    app.config.update(SECRET_KEY="test", TESTING=True)
+    register_admin_blueprint(app)
+    app.extensions["bot_manager"] = _FakeBotManager()
+    app.extensions["bot_tasks"] = BotTaskRunner(app)
+    yield app
+    app.extensions["bot_manager"].release.set()
+
+
+# NOTE[agent]: Клиент с авторизованной сессией администратора.
+@pytest.fixture()
+def client(bot_app: Flask) -> FlaskClient:
+    """Возвращает тестовый клиент с флагом входа в сессии."""
+
+    test_client = bot_app.test_client()
+    with test_client.session_transaction() as session:
+        session[ADMIN_SESSION_KEY] = True
+    return test_client
+
+
+# NOTE[agent]: Дожидается завершения текущей операции без опроса по времени.
+def _wait_for_task(bot_app: Flask) -> None:
+    """Блокирует тест до окончания фоновой операции."""
+
+    bot_app.extensions["bot_tasks"]._future.result(timeout=5)  # pylint: disable=protected-access
+
+
+# NOTE[agent]: Проверяет приём операции и её успешное завершение.
+def test_submit_returns_accepted_and_completes(bot_app: Flask, client: FlaskClient) -> None:
+    """Убеждается, что запуск ставится в очередь с кодом 202 и завершается статусом done."""
+
+    response = client.post("/admin/api/bot/start-polling")
+
+    assert response.status_code == 202
+    assert response.get_json() == {"status": "accepted", "operation": "start_polling"}
+    _wait_for_task(bot_app)
+    task = client.get("/admin/api/bot/status").get_json()["task"]
+    assert task["operation"] == "start_polling"
+    assert task["status"] == BotTaskRunner.STATUS_DONE
+    assert bot_app.extensions["bot_manager"].polling_calls == 1
+
+
+# NOTE[agent]: Проверяет отказ, пока предыдущая операция ещё выполняется.
+def test_submit_while_running_returns_conflict(bot_app: Flask, client: FlaskClient) -> None:
+    """Убеждается, что вторая операция во время первой получает 409."""
+
+    bot_manager = bot_app.extensions["bot_manager"]
+    bot_manager.release.clear()
+
+    assert client.post("/admin/api/bot/start-polling").status_code == 202
+    assert bot_manager.started.wait(timeout=5)
+    response = client.post("/admin/api/bot/stop")
+
+    assert response.status_code == 409
+    assert client.get("/admin/api/bot/status").get_json()["task"]["status"] == (
+        BotTaskRunner.STATUS_PENDING
+    )
+    bot_manager.release.set()
+    _wait_for_task(bot_app)
+    assert bot_manager.polling_calls == 1
+
+
+# NOTE[agent]: Проверяет, что ошибка операции видна в статусе.
+def test_failed_task_reports_error(bot_app: Flask, client: FlaskClient) -> None:
+    """Убеждается, что исключение операции отражается статусом failed и сообщением."""
+
+    assert client.post("/admin/api/bot/stop").status_code == 202
+    _wait_for_task(bot_app)
+    response = client.get("/admin/api/bot/status")
+
+    assert response.status_code == 200
+    task = response.get_json()["task"]
+    assert task["operation"] == "stop"
+    assert task["status"] == BotTaskRunner.STATUS_FAILED
+    assert task["message"] == "stop failed"
+
+
+# NOTE[agent]: Проверяет ответ статуса бота без авторизации.
+def test_status_requires_authentication(bot_app: Flask) -> None:
+    """Убеждается, что опрос статуса без входа получает 401 в JSON, а не редирект."""
+
+    response = bot_app.test_client().get("/admin/api/bot/status")
+
+    assert response.status_code == 401
+    assert response.get_json() == {"status": "error", "message": "Unauthorized"}
+    assert "task" not in response.get_json()
@@ -0,0 +1,47 @@
+"""Тесты JSON-провайдера на базе orjson."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from flask import Flask, jsonify, request
+
+from app.web.json_provider import OrjsonProvider
+
+
+# NOTE[agent]: Создаёт минимальное приложение с подключённым провайдером.
+def _make_app() -> Flask:
+    """Возвращает приложение Flask, использующее OrjsonProvider."""
+
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    return app
+
+
+# NOTE[agent]: Проверяет, что jsonify отдаёт байты orjson с корректным типом содержимого.
+def test_jsonify_uses_orjson_provider() -> None:
+    """Убеждается, что ответ сериализуется без потерь для типов приложения."""
+
+    app = _make_app()
+    with app.app_context():
+        response = jsonify({"price": Decimal("1.50"), 1: "один", "text": "привет"})
+
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"price": "1.50", "1": "один", "text": "привет"}
+
+
+# NOTE[agent]: Проверяет разбор тела webhook через провайдер приложения.
+def test_request_json_is_parsed_by_provider() -> None:
+    """Убеждается, что request.get_json разбирает UTF-8 тело через orjson."""
+
+    app = _make_app()
+
+    @app.post("/echo")
+    def echo():
+        return jsonify(request.get_json())
+
+    client = app.test_client()
+    response = client.post("/echo", json={"update_id": 1, "message": {"text": "привет"}})
+
+    assert response.status_code == 200
+    assert response.get_json() == {"update_id": 1, "message": {"text": "привет"}}
@@ -0,0 +1,134 @@
+"""Тесты записи настроек и их процессного кеша."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, func, select, update
+
+from app.models import AppSetting, db
+from app.services import settings_service as settings_module
+from app.services.settings_service import SettingsService
+
+
+# NOTE[agent]: Приложение с временной SQLite-базой и пустым кешем настроек.
+@pytest.fixture()
+def settings_app(tmp_path: Path) -> Iterator[Flask]:
+    """Создаёт приложение с таблицами и одной исходной настройкой."""
+
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///" + str(tmp_path / "test.sqlite"),
+        TESTING=True,
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(AppSetting(key="active_model_id", value="1"))
+        db.session.commit()
+        SettingsService._invalidate_cache()  # pylint: disable=protected-access
+        yield app
+        db.session.remove()
+        db.drop_all()
+        SettingsService._invalidate_cache()  # pylint: disable=protected-access
+
+
+# NOTE[agent]: Сообщает, лежит ли снимок настроек в процессном кеше.
+def _snapshot_is_cached() -> bool:
+    """Проверяет наличие снимка настроек в кеше."""
+
+    return settings_module._ALL_SETTINGS_CACHE_KEY in settings_module._SETTINGS_CACHE
+
+
+# NOTE[agent]: Проверяет пакетную запись через UPSERT и сброс кеша после неё.
+def test_set_many_upserts_and_invalidates_cache(settings_app: Flask) -> None:
+    """Убеждается, что set_many обновляет и добавляет ключи без дублей строк."""
+
+    service = SettingsService()
+    assert service.get("active_model_id") == "1"
+    assert _snapshot_is_cached()
+
+    service.set_many({"active_model_id": 2, "bot_paused": "true"})
+
+    assert not _snapshot_is_cached()
+    assert service.get("active_model_id") == "2"
+    assert service.get("bot_paused") == "true"
+    assert db.session.scalar(select(func.count()).select_from(AppSetting)) == 2
+
+
+# NOTE[agent]: Проверяет запись через ORM для диалектов без ON CONFLICT.
+def test_set_many_falls_back_to_orm_without_upsert(
+    settings_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Убеждается, что без UPSERT настройки сохраняются поштучно с тем же результатом."""
+
+    monkeypatch.setattr(settings_module, "upsert_insert", lambda model: None)
+    service = SettingsService()
+    assert service.get("active_model_id") == "1"
+
+    service.set_many({"active_model_id": 3, "bot_paused": "false"})
+
+    assert not _snapshot_is_cached()
+    assert service.get("active_model_id") == "3"
+    assert service.get("bot_paused") == "false"
+    assert db.session.scalar(select(func.count()).select_from(AppSetting)) == 2
+
+
+# NOTE[agent]: Проверяет, что снимок, прочитанный до записи, не скрывает её на время TTL.
+def test_snapshot_read_during_write_is_not_cached(settings_app: Flask) -> None:
+    """Убеждается, что сброс кеша во время чтения снимка отменяет его сохранение."""
+
+    service = SettingsService()
+    invalidated = []
+
+    def _invalidate_during_read(conn, cursor, statement, parameters, context, executemany):
+        if not invalidated and "app_settings" in statement:
+            invalidated.append(statement)
+            # NOTE[agent]: Так выглядит для читателя параллельная запись: она
+            # сбрасывает кеш, пока снимок ещё не сохранён.
+            SettingsService._invalidate_cache()  # pylint: disable=protected-access
+
+    engine = db.engine
+    event.listen(engine, "after_cursor_execute", _invalidate_during_read)
+    try:
+        assert service.get("active_model_id") == "1"
+    finally:
+        event.remove(engine, "after_cursor_execute", _invalidate_during_read)
+
+    assert invalidated
+    assert not _snapshot_is_cached()
+    db.session.execute(update(AppSetting).values(value="2"))
+    db.session.commit()
+    assert service.get("active_model_id") == "2"
+
+
+# NOTE[agent]: Проверяет отложенный до фиксации сброс кеша при set(commit=False).
+def test_set_without_commit_invalidates_after_commit(settings_app: Flask) -> None:
+    """Убеждается, что снимок сбрасывается фиксацией, а не постановкой записи."""
+
+    service = SettingsService()
+    assert service.get("active_model_id") == "1"
+
+    service.set("active_model_id", "5", commit=False)
+
+    assert _snapshot_is_cached()
+    db.session.commit()
+    assert not _snapshot_is_cached()
+    assert service.get("active_model_id") == "5"
+
+
+# NOTE[agent]: Проверяет сброс кеша при откате незафиксированной записи.
+def test_set_without_commit_invalidates_after_rollback(settings_app: Flask) -> None:
+    """Убеждается, что после отката снимок перечитывается с исходным значением."""
+
+    service = SettingsService()
+    assert service.get("active_model_id") == "1"
+
+    service.set("active_model_id", "5", commit=False)
+    db.session.rollback()
+
+    assert not _snapshot_is_cached()
+    assert service.get("active_model_id") == "1"
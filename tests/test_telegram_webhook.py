@@ -0,0 +1,68 @@
+"""Тесты регистрации маршрута webhook Telegram."""
+
+from __future__ import annotations
+
+import io
+
+from flask import Flask
+
+from app.web.telegram_webhook import MAX_WEBHOOK_BYTES, create_telegram_webhook_blueprint
+
+
+# NOTE[agent]: Проверяет, что каждое приложение получает webhook по своему пути.
+def test_webhook_route_registered_per_app() -> None:
+    """Убеждается, что повторное создание приложения не ломает регистрацию webhook."""
+
+    for path in ("bot/first", "/bot/second"):
+        app = Flask(__name__)
+        app.register_blueprint(create_telegram_webhook_blueprint(path))
+
+        rules = [rule.rule for rule in app.url_map.iter_rules("telegram_webhook.telegram_webhook")]
+        assert rules == ["/" + path.lstrip("/")]
+
+
+# NOTE[agent]: Проверяет путь по умолчанию при пустой настройке.
+def test_webhook_route_uses_default_path() -> None:
+    """Убеждается, что пустой путь заменяется на /bot/webhook."""
+
+    app = Flask(__name__)
+    app.register_blueprint(create_telegram_webhook_blueprint(""))
+
+    response = app.test_client().post("/bot/webhook", json={"update_id": 1})
+
+    assert response.status_code == 500
+    assert response.get_json()["message"] == "Bot manager is not configured"
+
+
+# NOTE[agent]: Проверяет отказ по размеру тела до обращения к менеджеру бота.
+def test_webhook_rejects_oversized_payload() -> None:
+    """Убеждается, что тело больше MAX_WEBHOOK_BYTES отклоняется с кодом 413."""
+
+    app = Flask(__name__)
+    app.register_blueprint(create_telegram_webhook_blueprint(""))
+
+    response = app.test_client().post(
+        "/bot/webhook",
+        data=b"0" * (MAX_WEBHOOK_BYTES + 1),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 413
+
+
+# NOTE[agent]: Проверяет ограничение размера для chunked-запроса без Content-Length.
+def test_webhook_rejects_oversized_chunked_payload() -> None:
+    """Убеждается, что лимит действует на поток тела, а не только на заголовок."""
+
+    app = Flask(__name__)
+    app.register_blueprint(create_telegram_webhook_blueprint(""))
+
+    response = app.test_client().post(
+        "/bot/webhook",
+        input_stream=io.BytesIO(b"0" * (MAX_WEBHOOK_BYTES + 1)),
+        content_type="application/json",
+        headers={"Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},
+    )
+
+    assert response.status_code == 413
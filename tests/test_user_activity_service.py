@@ -0,0 +1,100 @@
+"""Тесты буфера отметок активности пользователей."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models import User, db
+from app.services import user_activity_service as activity_module
+from app.services.user_activity_service import UserActivityBuffer
+
+# NOTE[agent]: Фиксированные отметки времени для сравнения с базой.
+FIRST_SEEN = datetime(2024, 1, 1, 10, 0, 0)
+LATER_SEEN = datetime(2024, 1, 1, 11, 0, 0)
+
+
+# NOTE[agent]: Приложение с временной SQLite-базой и одним пользователем.
+@pytest.fixture()
+def activity_app(tmp_path: Path) -> Iterator[Flask]:
+    """Создаёт приложение с таблицами и пользователем с id=1."""
+
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI="sqlite:///" + str(tmp_path / "test.sqlite"),
+        TESTING=True,
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(telegram_id="1", last_active_at=datetime(2000, 1, 1)))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+# NOTE[agent]: Читает сохранённое время активности пользователя.
+def _last_active_at(app: Flask) -> datetime:
+    """Возвращает last_active_at пользователя с id=1 из базы."""
+
+    with app.app_context():
+        db.session.expire_all()
+        return db.session.get(User, 1).last_active_at
+
+
+# NOTE[agent]: Проверяет запись накопленных отметок одним сбросом.
+def test_flush_writes_recorded_activity(activity_app: Flask) -> None:
+    """Убеждается, что flush сохраняет last_active_at и очищает буфер."""
+
+    activity_buffer = UserActivityBuffer()
+    activity_buffer.record(1, FIRST_SEEN)
+
+    with activity_app.app_context():
+        assert activity_buffer.flush() == 1
+        assert activity_buffer.flush() == 0
+
+    assert _last_active_at(activity_app) == FIRST_SEEN
+
+
+# NOTE[agent]: Проверяет возврат отметок в буфер без перезаписи более свежих.
+def test_failed_flush_requeues_without_overwriting_newer_activity(
+    activity_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Убеждается, что после ошибки в буфере остаётся отметка, записанная во время сброса."""
+
+    activity_buffer = UserActivityBuffer()
+    activity_buffer.record(1, FIRST_SEEN)
+
+    def _failing_execute(*args, **kwargs):
+        activity_buffer.record(1, LATER_SEEN)
+        raise SQLAlchemyError("database is unavailable")
+
+    with activity_app.app_context():
+        monkeypatch.setattr(db.session, "execute", _failing_execute)
+        with pytest.raises(SQLAlchemyError):
+            activity_buffer.flush()
+        monkeypatch.undo()
+        assert activity_buffer.flush() == 1
+
+    assert _last_active_at(activity_app) == LATER_SEEN
+
+
+# NOTE[agent]: Проверяет сохранение остатка буфера при остановке.
+def test_stop_flushes_pending_activity(activity_app: Flask) -> None:
+    """Убеждается, что stop() дописывает отметки и снимает буфер с учёта atexit."""
+
+    activity_buffer = UserActivityBuffer(flush_interval=60)
+    activity_buffer.start(activity_app)
+    assert activity_buffer in activity_module._ACTIVE_BUFFERS
+    activity_buffer.record(1, FIRST_SEEN)
+
+    activity_buffer.stop()
+
+    assert activity_buffer not in activity_module._ACTIVE_BUFFERS
+    assert _last_active_at(activity_app) == FIRST_SEEN